@@ -6,54 +6,77 @@ including request processing times, memory usage, and overall throughput.
 
 import libcachesim as lcs
 import os
+import re
 import sys
-import tracemalloc
-from time import perf_counter, sleep
+from time import perf_counter_ns, sleep
 import subprocess
-import matplotlib.pyplot as plt
+import shutil
 import numpy as np
-import statistics
 import psutil
 import logging
+import gc
 import threading
-from typing import List, Tuple, Dict, Any, Optional
+import multiprocessing
+from typing import Callable, List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass
+from contextlib import contextmanager
 
 # Default configuration
 DEFAULT_NUM_ITERATIONS = 20
 DEFAULT_CACHE_SIZE_RATIO = 0.1
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_NUM_WORKERS = 1
+
+# First "miss ratio"/"miss rate" value in cachesim output, skipping the byte and
+# interval variants that share the same suffix
+_MISS_RATIO_RE = re.compile(r"(?<!byte )(?<!interval )miss (?:ratio|rate)[:=\s]+([0-9]*\.?[0-9]+(?:[eE][+-]?[0-9]+)?)",
+                            re.IGNORECASE)
 
 @dataclass
 class BenchmarkResult:
-    """Store benchmark results for a single method."""
+    """Store benchmark results for a single method.
+    
+    Each field is a column with one entry per successful iteration.
+    """
     method_name: str
-    execution_times: List[float]
-    memory_usage: List[float]
-    miss_ratios: List[float]
+    execution_times_ns: np.ndarray
+    memory_usage: np.ndarray
+    miss_ratios: np.ndarray
+    
+    @property
+    def execution_times(self) -> np.ndarray:
+        """Execution times in seconds, for display and export."""
+        return self.execution_times_ns / 1e9
     
     @property
     def mean_time(self) -> float:
-        return statistics.mean(self.execution_times)
+        return float(self.execution_times_ns.mean()) / 1e9
     
     @property
     def std_time(self) -> float:
-        return statistics.stdev(self.execution_times) if len(self.execution_times) > 1 else 0.0
+        return float(self.execution_times_ns.std(ddof=1)) / 1e9 if self.execution_times_ns.size > 1 else 0.0
     
     @property
     def min_time(self) -> float:
-        return min(self.execution_times)
+        return float(self.execution_times_ns.min()) / 1e9
     
     @property
     def max_time(self) -> float:
-        return max(self.execution_times)
+        return float(self.execution_times_ns.max()) / 1e9
+    
+    @property
+    def percentile_times(self) -> Tuple[float, float, float]:
+        """p50, p95 and p99 execution times in seconds."""
+        p50, p95, p99 = np.percentile(self.execution_times_ns, [50, 95, 99]) / 1e9
+        return float(p50), float(p95), float(p99)
     
     @property
     def mean_memory(self) -> float:
-        return statistics.mean(self.memory_usage) if self.memory_usage else 0.0
+        return float(self.memory_usage.mean()) if self.memory_usage.size else 0.0
     
     @property
     def mean_miss_ratio(self) -> float:
-        return statistics.mean(self.miss_ratios)
+        return float(self.miss_ratios.mean())
 
 class SubprocessMemoryMonitor:
     """Monitor memory usage of a subprocess."""
@@ -95,20 +118,175 @@ class SubprocessMemoryMonitor:
             # Process doesn't exist
             pass
 
+_process: Optional[psutil.Process] = None
+
+
+def _get_process_memory() -> float:
+    """Get current process memory usage in MB."""
+    global _process
+    # Reuse one handle per process; a forked worker must not reuse its parent's
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process(os.getpid())
+    return _process.memory_info().rss / 1024 / 1024
+
+
+def _open_reader(trace_path: str) -> lcs.TraceReader:
+    """Open the trace with the settings shared by all Python methods."""
+    reader = lcs.TraceReader(
+        trace=trace_path,
+        trace_type=lcs.TraceType.ORACLE_GENERAL_TRACE,
+        reader_init_params=lcs.ReaderInitParam(ignore_obj_size=True)
+    )
+    # Let the kernel prefetch trace pages while the simulation runs
+    reader.advise_sequential()
+    return reader
+
+
+@contextmanager
+def _gc_paused():
+    """Keep the cyclic GC out of the timed region.
+
+    A full collection first puts every iteration in the same state, and objects
+    still tracked afterwards are logged as allocations the iteration retained.
+    """
+    gc.collect()
+    n_objects = len(gc.get_objects())
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+    retained = len(gc.get_objects()) - n_objects
+    if retained > 0:
+        logging.getLogger(__name__).debug(f"{retained} objects still tracked by the GC after the timed region")
+
+
+# The per-iteration runners below are module-level so they can be pickled and
+# dispatched to worker processes. Each returns (execution_time_ns, memory_delta, miss_ratio).
+
+def _run_one_c_process_trace(trace_path: str, cache_size: int) -> Tuple[int, float, float]:
+    """Run one c_process_trace iteration."""
+    reader = _open_reader(trace_path)
+    cache = lcs.LRU(cache_size=cache_size)
+    
+    memory_before = _get_process_memory()
+    
+    # Setup is excluded so only trace processing is timed
+    with _gc_paused():
+        start_ns = perf_counter_ns()
+        
+        # Process trace
+        req_miss_ratio, byte_miss_ratio = cache.process_trace(reader)
+        
+        end_ns = perf_counter_ns()
+    
+    memory_after = _get_process_memory()
+    
+    return end_ns - start_ns, memory_after - memory_before, req_miss_ratio
+
+
+def _run_one_python_loop(trace_path: str, cache_size: int) -> Tuple[int, float, float]:
+    """Run one per-request Python loop iteration."""
+    reader = _open_reader(trace_path)
+    cache = lcs.LRU(cache_size=cache_size)
+    
+    memory_before = _get_process_memory()
+    
+    # Setup is excluded so only trace processing is timed
+    with _gc_paused():
+        start_ns = perf_counter_ns()
+        
+        # Manual loop processing
+        n_miss = 0
+        n_req = 0
+        
+        # One Request is refilled in place; it is not kept past cache.get
+        get = cache.get
+        for request in reader.iter_requests(copy=False):
+            n_req += 1
+            if not get(request):
+                n_miss += 1
+        
+        req_miss_ratio = n_miss / n_req if n_req > 0 else 0.0
+        
+        end_ns = perf_counter_ns()
+    
+    memory_after = _get_process_memory()
+    
+    return end_ns - start_ns, memory_after - memory_before, req_miss_ratio
+
+
+def _run_one_python_batched(trace_path: str, cache_size: int,
+                            batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[int, float, float]:
+    """Run one batched Python loop iteration."""
+    # Buffers are allocated once and refilled by the reader on every batch
+    obj_ids = np.empty(batch_size, dtype=np.uint64)
+    obj_sizes = np.empty(batch_size, dtype=np.int64)
+    
+    reader = _open_reader(trace_path)
+    cache = lcs.LRU(cache_size=cache_size)
+    
+    memory_before = _get_process_memory()
+    
+    # Setup is excluded so only trace processing is timed
+    with _gc_paused():
+        start_ns = perf_counter_ns()
+        
+        # Batched loop processing: one reader call and one cache call per batch
+        n_miss = 0
+        n_req = 0
+        
+        while True:
+            n_read = reader.read_batch(obj_ids, obj_sizes)
+            if n_read == 0:
+                break
+            hits = cache.get_batch(obj_ids[:n_read], obj_sizes[:n_read])
+            n_req += n_read
+            n_miss += n_read - np.count_nonzero(hits)
+        
+        req_miss_ratio = n_miss / n_req if n_req > 0 else 0.0
+        
+        end_ns = perf_counter_ns()
+    
+    memory_after = _get_process_memory()
+    
+    return end_ns - start_ns, memory_after - memory_before, req_miss_ratio
+
+
+def _run_warm(run_one: Callable[..., Tuple[int, float, float]], *args) -> Tuple[int, float, float]:
+    """Run a discarded warmup of ``run_one`` and then time it, in the same process.
+
+    Pool workers start cold, so each one warms itself up before the timed run.
+    """
+    run_one(*args)
+    return run_one(*args)
+
+
 class CacheSimulationBenchmark:
     """Comprehensive benchmark for cache simulation performance."""
     
     def __init__(self, trace_path: str, num_iterations: int = DEFAULT_NUM_ITERATIONS, 
-                 cache_size_ratio: float = DEFAULT_CACHE_SIZE_RATIO):
+                 cache_size_ratio: float = DEFAULT_CACHE_SIZE_RATIO, num_workers: int = DEFAULT_NUM_WORKERS,
+                 isolate: bool = False):
         self.trace_path = trace_path
         self.num_iterations = num_iterations
         self.cache_size_ratio = cache_size_ratio
+        self.num_workers = num_workers
+        self.isolate = isolate
         self.results: Dict[str, BenchmarkResult] = {}
         self.logger = self._setup_logging()
         
         # Validate trace file
         if not os.path.exists(trace_path):
             raise FileNotFoundError(f"Trace file not found: {trace_path}")
+        
+        # The working set size only depends on the trace, so scan it once here
+        # rather than inside every timed iteration
+        reader = _open_reader(trace_path)
+        self.cache_size = int(reader.get_working_set_size()[0] * cache_size_ratio)
+        del reader
     
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration."""
@@ -118,11 +296,6 @@ class CacheSimulationBenchmark:
         )
         return logging.getLogger(__name__)
     
-    def _get_process_memory(self) -> float:
-        """Get current process memory usage in MB."""
-        process = psutil.Process(os.getpid())
-        return process.memory_info().rss / 1024 / 1024
-    
     def _find_cachesim_binary(self) -> Optional[str]:
         """Find the cachesim binary in common locations."""
         possible_paths = [
@@ -136,72 +309,58 @@ class CacheSimulationBenchmark:
             if os.path.exists(path):
                 return path
             elif path == "cachesim":
-                # Check if it's in PATH
-                try:
-                    result = subprocess.run(["which", "cachesim"], 
-                                          capture_output=True, text=True)
-                    if result.returncode == 0:
-                        return "cachesim"
-                except FileNotFoundError:
-                    # 'which' command not available (e.g., on Windows)
-                    pass
+                # Check if it's in PATH without forking a 'which' process
+                return shutil.which("cachesim")
         
         return None
     
     def _parse_native_c_output(self, output: str) -> float:
         """Parse miss ratio from native C binary output."""
-        try:
-            for line in output.split('\n'):
-                line = line.strip()
-                if 'miss ratio' in line.lower():
-                    # Try to extract the last number from the line
-                    parts = line.split()
-                    for part in reversed(parts):
-                        try:
-                            return float(part.rstrip('%,.:'))
-                        except ValueError:
-                            continue
-                # Alternative patterns
-                elif 'miss rate' in line.lower():
-                    parts = line.split()
-                    for part in reversed(parts):
-                        try:
-                            return float(part.rstrip('%,.:'))
-                        except ValueError:
-                            continue
-        except (ValueError, IndexError, AttributeError) as e:
-            self.logger.warning(f"Could not parse miss ratio from native C output: {e}")
-        
-        return 0.0  # Default value if parsing fails
+        match = _MISS_RATIO_RE.search(output)
+        if match is None:
+            self.logger.warning("Could not parse miss ratio from native C output")
+            return 0.0  # Default value if parsing fails
+        return float(match.group(1))
     
     def _benchmark_native_c(self) -> BenchmarkResult:
         """Benchmark native C binary execution with proper subprocess memory monitoring."""
         self.logger.info("Benchmarking native C binary...")
         
-        execution_times = []
-        memory_usage = []
-        miss_ratios = []
+        # Columns are filled by index; n_ok counts successful iterations
+        execution_times_ns = np.empty(self.num_iterations, dtype=np.int64)
+        memory_usage = np.empty(self.num_iterations, dtype=np.float64)
+        miss_ratios = np.empty(self.num_iterations, dtype=np.float64)
+        n_ok = 0
         
         cachesim_path = self._find_cachesim_binary()
         if not cachesim_path:
             self.logger.warning("Native C binary not found, skipping native benchmark")
-            return BenchmarkResult("Native C", [], [], [])
+            return BenchmarkResult("Native C", execution_times_ns[:0], memory_usage[:0], miss_ratios[:0])
+        
+        cmd = [
+            cachesim_path,
+            self.trace_path,
+            "oracleGeneral",
+            "LRU",
+            "1",
+            "--ignore-obj-size", "1"
+        ]
+        
+        # First iteration is warmup and is discarded
+        self.logger.info("Native C - Warmup iteration (discarded)")
+        try:
+            subprocess.run(cmd, capture_output=True)
+        except (subprocess.SubprocessError, OSError) as e:
+            self.logger.warning(f"Native C warmup failed: {e}")
         
         for i in range(self.num_iterations):
             self.logger.info(f"Native C - Iteration {i+1}/{self.num_iterations}")
             
             try:
-                start_time = perf_counter()
+                start_ns = perf_counter_ns()
                 
                 # Use Popen for better control over the subprocess
-                process = subprocess.Popen([
-                    cachesim_path,
-                    self.trace_path,
-                    "oracleGeneral",
-                    "LRU",
-                    "1",
-                    "--ignore-obj-size", "1"
-                ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
                 
                 # Start memory monitoring
                 memory_monitor = SubprocessMemoryMonitor(process.pid)
@@ -209,7 +368,7 @@ class CacheSimulationBenchmark:
                 
                 # Wait for process to complete
                 stdout, stderr = process.communicate()
-                end_time = perf_counter()
+                end_ns = perf_counter_ns()
                 
                 # Stop memory monitoring
                 peak_memory = memory_monitor.stop_monitoring()
@@ -219,139 +378,100 @@ class CacheSimulationBenchmark:
                     self.logger.warning(f"stderr: {stderr}")
                     continue
                 
-                execution_time = end_time - start_time
+                execution_time_ns = end_ns - start_ns
                 miss_ratio = self._parse_native_c_output(stdout)
                 
-                execution_times.append(execution_time)
-                memory_usage.append(peak_memory)
-                miss_ratios.append(miss_ratio)
+                execution_times_ns[n_ok] = execution_time_ns
+                memory_usage[n_ok] = peak_memory
+                miss_ratios[n_ok] = miss_ratio
+                n_ok += 1
                 
             except (subprocess.SubprocessError, OSError) as e:
                 self.logger.warning(f"Native C execution failed: {e}")
                 continue
         
-        return BenchmarkResult("Native C", execution_times, memory_usage, miss_ratios)
+        return BenchmarkResult("Native C", execution_times_ns[:n_ok], memory_usage[:n_ok], miss_ratios[:n_ok])
     
-    def _benchmark_c_process_trace(self) -> BenchmarkResult:
-        """Benchmark Python with c_process_trace method."""
-        self.logger.info("Benchmarking Python c_process_trace...")
-        
-        execution_times = []
-        memory_usage = []
-        miss_ratios = []
-        
-        for i in range(self.num_iterations):
-            self.logger.info(f"c_process_trace - Iteration {i+1}/{self.num_iterations}")
-            
-            # Start memory tracking
-            tracemalloc.start()
-            memory_before = self._get_process_memory()
-            
-            start_time = perf_counter()
-            
+    def _run_iterations(self, method_name: str, run_one: Callable[..., Tuple[int, float, float]],
+                        *args) -> BenchmarkResult:
+        """Run ``run_one(*args)`` for every iteration, in worker processes if num_workers > 1 or isolate is set."""
+        # Columns are filled by index; n_ok counts successful iterations
+        execution_times_ns = np.empty(self.num_iterations, dtype=np.int64)
+        memory_usage = np.empty(self.num_iterations, dtype=np.float64)
+        miss_ratios = np.empty(self.num_iterations, dtype=np.float64)
+        n_ok = 0
+        
+        pool = None
+        if self.num_workers > 1 or self.isolate:
+            # maxtasksperchild=1 gives every iteration a fresh process, so memory
+            # deltas are not polluted by allocations from earlier iterations. Spawned
+            # (not forked) workers also start without this process's malloc arenas,
+            # which earlier methods have already fragmented. Since every worker is
+            # cold, each one runs its own discarded warmup before the timed run.
+            ctx = multiprocessing.get_context("spawn")
+            pool = ctx.Pool(processes=self.num_workers, maxtasksperchild=1)
+            pending = [pool.apply_async(_run_warm, (run_one, *args)) for _ in range(self.num_iterations)]
+        else:
+            # First iteration is warmup: it pays for first-touch page faults on the trace
+            # and the extension module and is discarded
+            self.logger.info(f"{method_name} - Warmup iteration (discarded)")
             try:
-                # Setup reader and cache
-                reader = lcs.TraceReader(
-                    trace=self.trace_path,
-                    trace_type=lcs.TraceType.ORACLE_GENERAL_TRACE,
-                    reader_init_params=lcs.ReaderInitParam(ignore_obj_size=True)
-                )
-                
-                wss_size = reader.get_working_set_size()
-                cache_size = int(wss_size[0] * self.cache_size_ratio)
-                cache = lcs.LRU(cache_size=cache_size)
-                
-                # Process trace
-                req_miss_ratio, byte_miss_ratio = cache.process_trace(reader)
-                
-                end_time = perf_counter()
-                
-                # Memory tracking
-                current, peak = tracemalloc.get_traced_memory()
-                tracemalloc.stop()
-                memory_after = self._get_process_memory()
-                
-                execution_times.append(end_time - start_time)
-                memory_usage.append(memory_after - memory_before)
-                miss_ratios.append(req_miss_ratio)
-                
+                run_one(*args)
             except Exception as e:
-                self.logger.error(f"c_process_trace iteration {i+1} failed: {e}")
-                tracemalloc.stop()
-                continue
+                self.logger.warning(f"{method_name} warmup failed: {e}")
         
-        return BenchmarkResult("Python c_process_trace", execution_times, memory_usage, miss_ratios)
+        try:
+            for i in range(self.num_iterations):
+                self.logger.info(f"{method_name} - Iteration {i+1}/{self.num_iterations}")
+                
+                try:
+                    execution_time_ns, memory_delta, miss_ratio = pending[i].get() if pool else run_one(*args)
+                except Exception as e:
+                    self.logger.error(f"{method_name} iteration {i+1} failed: {e}")
+                    continue
+                
+                execution_times_ns[n_ok] = execution_time_ns
+                memory_usage[n_ok] = memory_delta
+                miss_ratios[n_ok] = miss_ratio
+                n_ok += 1
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        
+        return BenchmarkResult(method_name, execution_times_ns[:n_ok], memory_usage[:n_ok], miss_ratios[:n_ok])
+    
+    def _benchmark_c_process_trace(self) -> BenchmarkResult:
+        """Benchmark Python with c_process_trace method."""
+        self.logger.info("Benchmarking Python c_process_trace...")
+        return self._run_iterations("Python c_process_trace", _run_one_c_process_trace,
+                                    self.trace_path, self.cache_size)
     
     def _benchmark_python_loop(self) -> BenchmarkResult:
         """Benchmark Python with manual loop."""
         self.logger.info("Benchmarking Python loop...")
-        
-        execution_times = []
-        memory_usage = []
-        miss_ratios = []
-        
-        for i in range(self.num_iterations):
-            self.logger.info(f"Python loop - Iteration {i+1}/{self.num_iterations}")
-            
-            # Start memory tracking
-            tracemalloc.start()
-            memory_before = self._get_process_memory()
-            
-            start_time = perf_counter()
-            
-            try:
-                # Setup reader and cache
-                reader = lcs.TraceReader(
-                    trace=self.trace_path,
-                    trace_type=lcs.TraceType.ORACLE_GENERAL_TRACE,
-                    reader_init_params=lcs.ReaderInitParam(ignore_obj_size=True)
-                )
-                
-                wss_size = reader.get_working_set_size()
-                cache_size = int(wss_size[0] * self.cache_size_ratio)
-                cache = lcs.LRU(cache_size=cache_size)
-                
-                # Manual loop processing
-                n_miss = 0
-                n_req = 0
-                reader.reset()
-                
-                for request in reader:
-                    n_req += 1
-                    hit = cache.get(request)
-                    if not hit:
-                        n_miss += 1
-                
-                req_miss_ratio = n_miss / n_req if n_req > 0 else 0.0
-                
-                end_time = perf_counter()
-                
-                # Memory tracking
-                current, peak = tracemalloc.get_traced_memory()
-                tracemalloc.stop()
-                memory_after = self._get_process_memory()
-                
-                execution_times.append(end_time - start_time)
-                memory_usage.append(memory_after - memory_before)
-                miss_ratios.append(req_miss_ratio)
-                
-            except Exception as e:
-                self.logger.error(f"Python loop iteration {i+1} failed: {e}")
-                tracemalloc.stop()
-                continue
-        
-        return BenchmarkResult("Python loop", execution_times, memory_usage, miss_ratios)
+        return self._run_iterations("Python loop", _run_one_python_loop,
+                                    self.trace_path, self.cache_size)
+    
+    def _benchmark_python_batched(self, batch_size: int = DEFAULT_BATCH_SIZE) -> BenchmarkResult:
+        """Benchmark Python loop that reads and looks up requests in batches."""
+        self.logger.info("Benchmarking Python batched loop...")
+        return self._run_iterations("Python batched loop", _run_one_python_batched,
+                                    self.trace_path, self.cache_size, batch_size)
     
     def run_benchmark(self) -> Dict[str, BenchmarkResult]:
         """Run all benchmarks and return results."""
         self.logger.info(f"Starting benchmark with {self.num_iterations} iterations")
         self.logger.info(f"Trace file: {self.trace_path}")
         self.logger.info(f"Cache size ratio: {self.cache_size_ratio}")
+        self.logger.info(f"Worker processes: {self.num_workers}")
+        self.logger.info(f"Isolated iterations: {self.isolate or self.num_workers > 1}")
         
         # Run benchmarks
         self.results["native_c"] = self._benchmark_native_c()
         self.results["c_process_trace"] = self._benchmark_c_process_trace()
         self.results["python_loop"] = self._benchmark_python_loop()
+        self.results["python_batched"] = self._benchmark_python_batched()
         
         return self.results
     
@@ -361,7 +481,7 @@ class CacheSimulationBenchmark:
         
         miss_ratios = []
         for name, result in self.results.items():
-            if result.execution_times and result.miss_ratios:  # Only check methods that ran successfully
+            if result.execution_times_ns.size and result.miss_ratios.size:  # Only check methods that ran successfully
                 miss_ratios.append((name, result.mean_miss_ratio))
         
         if len(miss_ratios) < 2:
@@ -393,7 +513,7 @@ class CacheSimulationBenchmark:
         
         # Basic statistics
         for name, result in self.results.items():
-            if not result.execution_times:
+            if not result.execution_times_ns.size:
                 print(f"\n{result.method_name}: No valid results")
                 continue
                 
@@ -401,17 +521,19 @@ class CacheSimulationBenchmark:
             print(f"  Execution Time:")
             print(f"    Mean: {result.mean_time:.4f} ± {result.std_time:.4f} seconds")
             print(f"    Range: [{result.min_time:.4f}, {result.max_time:.4f}] seconds")
+            p50, p95, p99 = result.percentile_times
+            print(f"    p50/p95/p99: {p50:.4f} / {p95:.4f} / {p99:.4f} seconds")
             print(f"  Memory Usage:")
-            if result.memory_usage:
+            if result.memory_usage.size:
                 print(f"    Mean: {result.mean_memory:.2f} MB")
             else:
                 print(f"    Mean: N/A")
             print(f"  Cache Performance:")
             print(f"    Mean Miss Ratio: {result.mean_miss_ratio:.4f}")
-            print(f"  Successful Iterations: {len(result.execution_times)}/{self.num_iterations}")
+            print(f"  Successful Iterations: {len(result.execution_times_ns)}/{self.num_iterations}")
         
         # Comparative analysis
-        valid_results = [(name, result) for name, result in self.results.items() if result.execution_times]
+        valid_results = [(name, result) for name, result in self.results.items() if result.execution_times_ns.size]
         if len(valid_results) >= 2:
             print(f"\n{'Comparative Analysis':=^60}")
             
@@ -434,7 +556,7 @@ class CacheSimulationBenchmark:
         # Throughput analysis
         print(f"\n{'Throughput Analysis':=^60}")
         for name, result in self.results.items():
-            if not result.execution_times:
+            if not result.execution_times_ns.size:
                 continue
             
             # Estimate traces per second
@@ -445,12 +567,21 @@ class CacheSimulationBenchmark:
         """Create comprehensive visualizations."""
         # Filter out empty results
         valid_results = {name: result for name, result in self.results.items() 
-                        if result.execution_times}
+                        if result.execution_times_ns.size}
         
         if not valid_results:
             self.logger.warning("No valid results to visualize")
             return
         
+        # Convert to seconds once; the plots below share these arrays
+        exec_times = {name: result.execution_times for name, result in valid_results.items()}
+        
+        # Imported here so --no_visualize never loads matplotlib; the Agg backend
+        # writes files directly and skips GUI toolkit probing
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        
         fig = plt.figure(figsize=(20, 15))
         
         # Setup subplots
@@ -458,12 +589,12 @@ class CacheSimulationBenchmark:
         
         # Plot 1: Execution times across iterations
         ax1 = fig.add_subplot(gs[0, :2])
-        iterations = range(1, self.num_iterations + 1)
+        iterations = np.arange(1, self.num_iterations + 1, dtype=np.int32)
         colors = ['blue', 'red', 'green', 'orange', 'purple']
         
         for i, (name, result) in enumerate(valid_results.items()):
-            if result.execution_times:
-                ax1.plot(iterations[:len(result.execution_times)], result.execution_times, 
+            if result.execution_times_ns.size:
+                ax1.plot(iterations[:result.execution_times_ns.size], exec_times[name], 
                         color=colors[i % len(colors)], label=result.method_name, 
                         marker='o', markersize=4, alpha=0.7)
         
@@ -475,8 +606,8 @@ class CacheSimulationBenchmark:
         
         # Plot 2: Box plot of execution times
         ax2 = fig.add_subplot(gs[0, 2])
-        execution_data = [result.execution_times for result in valid_results.values() if result.execution_times]
-        labels = [result.method_name.replace(' ', '\n') for result in valid_results.values() if result.execution_times]
+        execution_data = [exec_times[name] for name, result in valid_results.items() if result.execution_times_ns.size]
+        labels = [result.method_name.replace(' ', '\n') for result in valid_results.values() if result.execution_times_ns.size]
         
         if execution_data:
             ax2.boxplot(execution_data, tick_labels=labels)  # Fixed matplotlib warning
@@ -486,11 +617,11 @@ class CacheSimulationBenchmark:
         
         # Plot 3: Memory usage comparison
         ax3 = fig.add_subplot(gs[1, 0])
-        methods_with_memory = [(result.method_name, result.mean_memory) for result in valid_results.values() if result.memory_usage]
+        methods_with_memory = [(result.method_name, result.mean_memory) for result in valid_results.values() if result.memory_usage.size]
         
         if methods_with_memory:
             methods, memory_means = zip(*methods_with_memory)
-            bars = ax3.bar(methods, memory_means, color=['blue', 'red', 'green'][:len(methods)])
+            bars = ax3.bar(methods, memory_means, color=['blue', 'red', 'green', 'orange'][:len(methods)])
             ax3.set_ylabel('Memory Usage (MB) (Python show extra memory usage)')
             ax3.set_title('Average Memory Usage')
             ax3.tick_params(axis='x', rotation=45)
@@ -504,16 +635,16 @@ class CacheSimulationBenchmark:
         # Plot 4: Performance comparison (relative to fastest)
         ax4 = fig.add_subplot(gs[1, 1])
         if len(valid_results) >= 2:
-            fastest_time = min(result.mean_time for result in valid_results.values() if result.execution_times)
+            fastest_time = min(result.mean_time for result in valid_results.values() if result.execution_times_ns.size)
             relative_times = []
             method_names = []
             
             for result in valid_results.values():
-                if result.execution_times:
+                if result.execution_times_ns.size:
                     relative_times.append(result.mean_time / fastest_time)
                     method_names.append(result.method_name)
             
-            bars = ax4.bar(method_names, relative_times, color=['green', 'orange', 'red'][:len(method_names)])
+            bars = ax4.bar(method_names, relative_times, color=['green', 'orange', 'red', 'purple'][:len(method_names)])
             ax4.set_ylabel('Relative Performance (1.0 = fastest)')
             ax4.set_title('Relative Performance Comparison')
             ax4.tick_params(axis='x', rotation=45)
@@ -526,8 +657,8 @@ class CacheSimulationBenchmark:
         
         # Plot 5: Miss ratio consistency
         ax5 = fig.add_subplot(gs[1, 2])
-        miss_ratio_data = [result.miss_ratios for result in valid_results.values() if result.miss_ratios]
-        miss_ratio_labels = [result.method_name.replace(' ', '\n') for result in valid_results.values() if result.miss_ratios]
+        miss_ratio_data = [result.miss_ratios for result in valid_results.values() if result.miss_ratios.size]
+        miss_ratio_labels = [result.method_name.replace(' ', '\n') for result in valid_results.values() if result.miss_ratios.size]
         
         if miss_ratio_data:
             ax5.boxplot(miss_ratio_data, tick_labels=miss_ratio_labels)
@@ -538,9 +669,9 @@ class CacheSimulationBenchmark:
         # Plot 6: Execution time histogram for each method
         ax6 = fig.add_subplot(gs[2, :])
         for i, (name, result) in enumerate(valid_results.items()):
-            if result.execution_times:
-                ax6.hist(result.execution_times, alpha=0.6, label=result.method_name, 
-                        bins=min(10, len(result.execution_times)), 
+            if result.execution_times_ns.size:
+                ax6.hist(exec_times[name], alpha=0.6, label=result.method_name, 
+                        bins=min(10, result.execution_times_ns.size), 
                         color=colors[i % len(colors)])
         
         ax6.set_xlabel('Execution Time (seconds)')
@@ -554,6 +685,7 @@ class CacheSimulationBenchmark:
                     fontsize=16, y=0.98)
         
         plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.close(fig)
         self.logger.info(f"Visualization saved as '{save_path}'")
         
         return save_path
@@ -562,31 +694,19 @@ class CacheSimulationBenchmark:
         """Export results to CSV file."""
         import csv
         
+        fieldnames = ['method', 'iteration', 'execution_time', 'memory_usage', 'miss_ratio']
+        # Build all rows up front and hand them to the C writer in one call
+        rows = [
+            (result.method_name, i + 1, exec_time, mem_usage, miss_ratio)
+            for result in self.results.values() if result.execution_times_ns.size
+            for i, (exec_time, mem_usage, miss_ratio) in enumerate(
+                zip(result.execution_times.tolist(), result.memory_usage.tolist(), result.miss_ratios.tolist()))
+        ]
+        
         with open(csv_path, 'w', newline='') as csvfile:
-            fieldnames = ['method', 'iteration', 'execution_time', 'memory_usage', 'miss_ratio']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for name, result in self.results.items():
-                if not result.execution_times:
-                    continue
-                
-                max_len = max(len(result.execution_times), 
-                             len(result.memory_usage) if result.memory_usage else 0,
-                             len(result.miss_ratios) if result.miss_ratios else 0)
-                
-                for i in range(max_len):
-                    exec_time = result.execution_times[i] if i < len(result.execution_times) else None
-                    mem_usage = result.memory_usage[i] if result.memory_usage and i < len(result.memory_usage) else None
-                    miss_ratio = result.miss_ratios[i] if result.miss_ratios and i < len(result.miss_ratios) else None
-                    
-                    writer.writerow({
-                        'method': result.method_name,
-                        'iteration': i + 1,
-                        'execution_time': exec_time,
-                        'memory_usage': mem_usage,
-                        'miss_ratio': miss_ratio
-                    })
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
         
         self.logger.info(f"Results exported to '{csv_path}'")
 
@@ -602,6 +722,11 @@ def main():
                        help=f"Number of iterations (default: {DEFAULT_NUM_ITERATIONS})")
     parser.add_argument("--cache_size_ratio", type=float, default=DEFAULT_CACHE_SIZE_RATIO,
                        help=f"Cache size as ratio of working set (default: {DEFAULT_CACHE_SIZE_RATIO})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_NUM_WORKERS,
+                       help=f"Worker processes for Python iterations; values above 1 trade timing "
+                            f"isolation for wall-clock time (default: {DEFAULT_NUM_WORKERS})")
+    parser.add_argument("--isolate", action="store_true",
+                       help="Run each Python iteration in a freshly spawned process, even with one worker")
     parser.add_argument("--output_dir", type=str, default=".",
                        help="Output directory for results (default: current directory)")
     parser.add_argument("--export_csv", action="store_true",
@@ -616,7 +741,9 @@ def main():
         benchmark = CacheSimulationBenchmark(
             trace_path=args.trace_path,
             num_iterations=args.iterations,
-            cache_size_ratio=args.cache_size_ratio
+            cache_size_ratio=args.cache_size_ratio,
+            num_workers=args.workers,
+            isolate=args.isolate
         )
         
         # Run benchmark
@@ -1,3 +1,5 @@
+import numpy as np
+
 from libcachesim import BloomFilterAdmissioner, SyntheticReader, LRU
 
 BloomFilter = BloomFilterAdmissioner()
@@ -21,11 +23,11 @@ reader = SyntheticReader(
 without_admission_hits = 0
 with_admission_hits = 0
 
-for req in reader:
-    if lru_without_admission.get(req):
-        without_admission_hits += 1
-    if lru_with_admission.get(req):
-        with_admission_hits += 1
+# Replay the same id/size arrays into both caches one batch at a time, instead
+# of two Python-level get() calls per request
+for obj_ids, obj_sizes in reader.batches(10_000):
+    without_admission_hits += int(np.count_nonzero(lru_without_admission.get_batch(obj_ids, obj_sizes)))
+    with_admission_hits += int(np.count_nonzero(lru_with_admission.get_batch(obj_ids, obj_sizes)))
 
 print(f'Obtained {without_admission_hits} without using cache admission')
 print(f'Obtained {with_admission_hits} using cache admission')
@@ -1,5 +1,5 @@
 from libcachesim import PluginAdmissioner, SyntheticReader, LRU
-import random
+import numpy as np
 
 '''
 A toy example where we admit ten percent of all requests
@@ -7,10 +7,25 @@ at random. The admit rate is tracked and printed in the
 free hook to serve as a final sanity check.
 '''
 
+# Admission decisions are drawn in bulk and consumed one per call
+DRAW_BATCH = 100_000
+
+
+def draw_decisions(rng):
+    # A plain list is cheaper to index from Python than an ndarray,
+    # which would box a NumPy scalar on every access
+    return (rng.integers(1, 11, size=DRAW_BATCH, dtype=np.int8) == 5).tolist()
+
 
 class AdmissionerStats:
-    admitted_requests: int = 0
-    total_requests: int = 0
+    __slots__ = ("admitted_requests", "total_requests", "rng", "decisions", "idx")
+
+    def __init__(self):
+        self.admitted_requests = 0
+        self.total_requests = 0
+        self.rng = np.random.default_rng(0)
+        self.decisions = draw_decisions(self.rng)
+        self.idx = 0
 
 
 def init_hook():
@@ -18,7 +33,12 @@ def init_hook():
 
 
 def admit_hook(data, request):
-    admit = random.randint(1, 10) == 5
+    # admit_hook runs on every miss, so it only indexes a precomputed draw
+    if data.idx == DRAW_BATCH:
+        data.decisions = draw_decisions(data.rng)
+        data.idx = 0
+    admit = data.decisions[data.idx]
+    data.idx += 1
     if admit:
         data.admitted_requests += 1
     data.total_requests += 1
@@ -58,8 +78,8 @@ reader = SyntheticReader(
     dist="zipf",
 )
 
-for req in reader:
+for req in reader.iter_requests(copy=False):
     lru_cache.get(req)
 
 # Invokes free_hook, percentage should be ~10%
-del lru_cache
+custom_admissioner.flush()
@@ -1,8 +1,12 @@
 from collections import OrderedDict
+
+import numpy as np
 from libcachesim import PluginCache, CommonCacheParams, Request, SyntheticReader, LRU
 
 
 class StandaloneLRU:
+    __slots__ = ("cache_data",)
+
     def __init__(self):
         self.cache_data = OrderedDict()
 
@@ -69,9 +73,12 @@ reader = SyntheticReader(
     dist="zipf",
 )
 
-for req in reader:
-    plugin_hit = plugin_lru_cache.get(req)
-    ref_hit = ref_lru_cache.get(req)
-    assert plugin_hit == ref_hit, f"Cache hit mismatch: {plugin_hit} != {ref_hit}"
+# Both caches consume the trace as id/size arrays instead of one Request per access
+for obj_ids, obj_sizes in reader.batches():
+    plugin_hits = plugin_lru_cache.get_batch(obj_ids, obj_sizes)
+    ref_hits = ref_lru_cache.get_batch(obj_ids, obj_sizes)
+    assert np.array_equal(plugin_hits, ref_hits), (
+        f"Cache hit mismatch at request {reader.current_pos - len(obj_ids) + np.argmax(plugin_hits != ref_hits)}"
+    )
 
 print("All requests processed successfully. Plugin cache matches reference LRU cache.")
@@ -4,13 +4,28 @@
 # Happy caching!
 
 import libcachesim as lcs
+import numpy as np
 from collections import OrderedDict
-from collections import deque
-from libcachesim import PluginCache, CommonCacheParams, Request, S3FIFO, FIFO, SyntheticReader
+from libcachesim import PluginCache, CommonCacheParams, Request, S3FIFO, SyntheticReader
 
 
 # NOTE(haocheng): we only support ignore object size for now
 class StandaloneS3FIFO:
+    # Hooks read these attributes on every request; slots avoid a per-instance dict
+    __slots__ = (
+        "cache_size",
+        "small_fifo_size",
+        "main_fifo_size",
+        "ghost_fifo_size",
+        "small_fifo",
+        "main_fifo",
+        "ghost_fifo",
+        "max_freq",
+        "move_to_main_threshold",
+        "has_evicted",
+        "hit_on_ghost",
+    )
+
     def __init__(
         self,
         small_size_ratio: float = 0.1,
@@ -19,20 +34,16 @@ class StandaloneS3FIFO:
         cache_size: int = 1024,
     ):
         self.cache_size = cache_size
-        small_fifo_size = int(small_size_ratio * cache_size)
-        main_fifo_size = cache_size - small_fifo_size
-        ghost_fifo_size = int(ghost_size_ratio * cache_size)
-
-        self.small_set = set()
-        self.main_set = set()
-        self.ghost_set = deque(maxlen=ghost_fifo_size)
+        self.small_fifo_size = int(small_size_ratio * cache_size)
+        self.main_fifo_size = cache_size - self.small_fifo_size
+        self.ghost_fifo_size = int(ghost_size_ratio * cache_size)
 
-        self.small_fifo = FIFO(small_fifo_size)
-        self.main_fifo = FIFO(main_fifo_size)
-        self.ghost_fifo = FIFO(ghost_fifo_size)
-
-        # Frequency tracking
-        self.freq = {}
+        # Each fifo maps obj_id -> frequency, oldest object first. With unit
+        # object sizes the occupied size of a fifo is its length.
+        self.small_fifo = OrderedDict()
+        self.main_fifo = OrderedDict()
+        # Ghost entries only record that the object was evicted recently
+        self.ghost_fifo = OrderedDict()
 
         # Other parameters
         self.max_freq = 3
@@ -42,116 +53,90 @@ class StandaloneS3FIFO:
         self.hit_on_ghost = False
 
     def cache_hit(self, req: Request):
-        hit_small = False
-        hit_main = False
-        if self.small_fifo.find(req, update_cache=False):
-            self.freq[req.obj_id] += 1
-
-        if self.main_fifo.find(req, update_cache=False):
-            self.freq[req.obj_id] += 1
+        obj_id = req.obj_id
+        # Most hits land in main, so probe it first and fall back to small;
+        # a hit on an object tracked by neither fifo is ignored
+        freq = self.main_fifo.get(obj_id)
+        if freq is not None:
+            self.main_fifo[obj_id] = freq + 1
+            return
+        freq = self.small_fifo.get(obj_id)
+        if freq is not None:
+            self.small_fifo[obj_id] = freq + 1
 
     def cache_miss(self, req: Request):
-        if not self.hit_on_ghost:
-            obj = self.ghost_fifo.find(req, update_cache=False)
-            if obj is not None:
-                self.hit_on_ghost = True
-                # remove from ghost set
-                self.ghost_fifo.remove(req.obj_id)
-                self.ghost_set.remove(req.obj_id)
+        obj_id = req.obj_id
+        hit_on_ghost = self.hit_on_ghost
+        if not hit_on_ghost:
+            # remove from ghost fifo
+            hit_on_ghost = self.ghost_fifo.pop(obj_id, False)
 
         # NOTE(haocheng): first we need to know this miss object has record in ghost or not
-        if not self.hit_on_ghost:
-            if req.obj_size >= self.small_fifo.cache_size:
+        if not hit_on_ghost:
+            small_fifo_size = self.small_fifo_size
+            if req.obj_size >= small_fifo_size:
                 # If object is too large, we do not process it
+                self.hit_on_ghost = False
                 return
 
             # If is initialization state, we need to insert to small fifo,
             # then we can insert to main fifo
-            if not self.has_evicted and self.small_fifo.get_occupied_byte() >= self.small_fifo.cache_size:
-                obj = self.main_fifo.insert(req)
-                self.main_set.add(obj.obj_id)
+            small_fifo = self.small_fifo
+            if not self.has_evicted and len(small_fifo) >= small_fifo_size:
+                self.main_fifo[obj_id] = 0
             else:
-                obj = self.small_fifo.insert(req)
-                self.small_set.add(obj.obj_id)
+                small_fifo[obj_id] = 0
         else:
-            obj = self.main_fifo.insert(req)
-            self.main_set.add(req.obj_id)
-            self.hit_on_ghost = False
-        self.freq[obj.obj_id] = 0
+            self.main_fifo[obj_id] = 0
+        self.hit_on_ghost = False
+
+    def insert_to_ghost(self, obj_id):
+        ghost_fifo = self.ghost_fifo
+        if obj_id in ghost_fifo:
+            return
+        if len(ghost_fifo) >= self.ghost_fifo_size:
+            ghost_fifo.popitem(last=False)
+        ghost_fifo[obj_id] = True
 
     def cache_evict_small(self, req: Request):
-        has_evicted = False
-        evicted_id = None
-        real_evicted_id = None
-        while not has_evicted and self.small_fifo.get_occupied_byte() > 0:
-            obj_to_evict = self.small_fifo.to_evict(req)
-            evicted_id = obj_to_evict.obj_id  # Store the ID before any operations
-            if self.freq[obj_to_evict.obj_id] >= self.move_to_main_threshold:
-                new_req = Request(obj_id=evicted_id, obj_size=1)
-                self.main_fifo.insert(new_req)
-                self.main_set.add(evicted_id)
-                # Reset frequency
-                self.freq[evicted_id] = 0
+        small_fifo, main_fifo = self.small_fifo, self.main_fifo
+        threshold = self.move_to_main_threshold
+        while small_fifo:
+            evicted_id, freq = small_fifo.popitem(last=False)
+            if freq >= threshold:
+                # Promote with reset frequency
+                main_fifo[evicted_id] = 0
             else:
-                new_req = Request(obj_id=evicted_id, obj_size=1)
-                self.ghost_fifo.get(new_req)
-                self.ghost_set.append(evicted_id)
-                has_evicted = True
-                real_evicted_id = evicted_id
-            flag = self.small_fifo.remove(evicted_id)
-            self.small_set.remove(evicted_id)
-            assert flag, "Should be able to remove"
-        return real_evicted_id
+                self.insert_to_ghost(evicted_id)
+                return evicted_id
+        return None
 
     def cache_evict_main(self, req: Request):
-        has_evicted = False
-        evicted_id = None
-        while not has_evicted and self.main_fifo.get_occupied_byte() > 0:
-            obj_to_evict = self.main_fifo.to_evict(req)
-            assert obj_to_evict is not None
-            evicted_id = obj_to_evict.obj_id  # Store the ID before any operations
-            freq = self.freq[evicted_id]
+        main_fifo = self.main_fifo
+        max_freq = self.max_freq
+        while main_fifo:
+            evicted_id, freq = main_fifo.popitem(last=False)
             if freq >= 1:
-                # Reinsert with decremented frequency
-                self.main_fifo.remove(evicted_id)
-                self.main_set.remove(evicted_id)
-                new_req = Request(obj_id=evicted_id, obj_size=1)
-                self.main_fifo.insert(new_req)
-                self.main_set.add(evicted_id)
-                self.freq[evicted_id] = min(freq, self.max_freq) - 1
+                # Reinsert at the tail with decremented frequency
+                main_fifo[evicted_id] = min(freq, max_freq) - 1
             else:
-                flag = self.main_fifo.remove(evicted_id)
-                self.main_set.remove(evicted_id)
-                has_evicted = True
-            # print(f"Evicted {evicted_id}")
-        return evicted_id
+                return evicted_id
+        return None
 
     def cache_evict(self, req: Request):
         if not self.hit_on_ghost:
-            obj = self.ghost_fifo.find(req, update_cache=False)
-            if obj is not None:
-                self.hit_on_ghost = True
-                # remove from ghost set
-                self.ghost_fifo.remove(req.obj_id)
-                self.ghost_set.remove(req.obj_id)
+            # remove from ghost fifo
+            self.hit_on_ghost = self.ghost_fifo.pop(req.obj_id, False)
 
         self.has_evicted = True
-        cond = self.main_fifo.get_occupied_byte() > self.main_fifo.cache_size
-        if cond or (self.small_fifo.get_occupied_byte() == 0):
-            obj_id = self.cache_evict_main(req)
-        else:
-            obj_id = self.cache_evict_small(req)
-
-        if obj_id is not None:
-            del self.freq[obj_id]
-
-        return obj_id
+        if len(self.main_fifo) > self.main_fifo_size or not self.small_fifo:
+            return self.cache_evict_main(req)
+        return self.cache_evict_small(req)
 
     def cache_remove(self, obj_id):
-        removed = False
-        removed |= self.small_fifo.remove(obj_id)
-        removed |= self.ghost_fifo.remove(obj_id)
-        removed |= self.main_fifo.remove(obj_id)
+        removed = self.small_fifo.pop(obj_id, None) is not None
+        removed |= self.ghost_fifo.pop(obj_id, None) is not None
+        removed |= self.main_fifo.pop(obj_id, None) is not None
         return removed
 
 
@@ -178,10 +163,6 @@ def cache_remove_hook(cache, obj_id):
     cache.cache_remove(obj_id)
 
 
-def cache_free_hook(cache):
-    pass
-
-
 cache = PluginCache(
     cache_size=1024,
     cache_init_hook=cache_init_hook,
@@ -189,7 +170,8 @@ cache = PluginCache(
     cache_miss_hook=cache_miss_hook,
     cache_eviction_hook=cache_eviction_hook,
     cache_remove_hook=cache_remove_hook,
-    cache_free_hook=cache_free_hook,
+    # No free hook: the plugin holds no resources beyond its Python objects
+    cache_free_hook=None,
     cache_name="S3FIFO",
 )
 
@@ -205,16 +187,23 @@ reader = lcs.TraceReader(
 # Use native S3FIFO for reference
 ref_s3fifo = S3FIFO(cache_size=1024, small_size_ratio=0.1, ghost_size_ratio=0.9, move_to_main_threshold=2)
 
-# for req in reader:
-#     hit = cache.get(req)
-#     ref_hit = ref_s3fifo.get(req)
-#     assert hit == ref_hit, f"Cache hit mismatch: {hit} != {ref_hit}"
-
-req_miss_ratio, byte_miss_ratio = cache.process_trace(reader)
-ref_req_miss_ratio, ref_byte_miss_ratio = ref_s3fifo.process_trace(reader)
-print(f"Plugin req miss ratio: {req_miss_ratio}, ref req miss ratio: {ref_req_miss_ratio}")
-print(f"Plugin byte miss ratio: {byte_miss_ratio}, ref byte miss ratio: {ref_byte_miss_ratio}")
-
-assert req_miss_ratio == ref_req_miss_ratio
-assert byte_miss_ratio == ref_byte_miss_ratio
+# Compare hits request by request; requests are read and looked up in
+# batches and the hit masks are compared once per batch
+obj_ids = np.empty(10_000, dtype=np.uint64)
+obj_sizes = np.empty(10_000, dtype=np.int64)
+n_req = n_miss = bytes_req = bytes_miss = 0
+while (n_read := reader.read_batch(obj_ids, obj_sizes)) > 0:
+    ids, sizes = obj_ids[:n_read], obj_sizes[:n_read]
+    hits = cache.get_batch(ids, sizes)
+    ref_hits = ref_s3fifo.get_batch(ids, sizes)
+    assert np.array_equal(hits, ref_hits), f"Cache hit mismatch at request {n_req + np.argmax(hits != ref_hits)}"
+    n_req += n_read
+    n_miss += n_read - np.count_nonzero(hits)
+    bytes_req += int(sizes.sum())
+    bytes_miss += int(sizes[~hits].sum())
+
+req_miss_ratio = n_miss / n_req if n_req > 0 else 0.0
+byte_miss_ratio = bytes_miss / bytes_req if bytes_req > 0 else 0.0
+print(f"Plugin and reference req miss ratio: {req_miss_ratio}")
+print(f"Plugin and reference byte miss ratio: {byte_miss_ratio}")
 print("All requests processed successfully. Plugin cache matches reference S3FIFO cache.")
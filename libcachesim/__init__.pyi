@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import Optional, Callable, Any
 from collections.abc import Iterator
 
+import numpy as np
+
 from .libcachesim_python import ReqOp, TraceType, SamplerType
 from .protocols import ReaderProtocol
 
@@ -127,8 +129,13 @@ class Cache:
 
     def __init__(self, init_params: CommonCacheParams, cache_specific_params: str = ""): ...
     def get(self, req: Request) -> bool: ...
+    def get_batch(
+        self, obj_ids: np.ndarray, obj_sizes: Optional[np.ndarray] = None, clock_times: Optional[np.ndarray] = None
+    ) -> np.ndarray: ...
     def find(self, req: Request, update_cache: bool = True) -> CacheObject: ...
+    def find_or_insert(self, req: Request, update_cache: bool = True) -> tuple[CacheObject | None, bool]: ...
     def can_insert(self, req: Request) -> bool: ...
+    def can_insert_batch(self, obj_ids: np.ndarray, obj_sizes: Optional[np.ndarray] = None) -> np.ndarray: ...
     def insert(self, req: Request) -> CacheObject: ...
     def need_eviction(self, req: Request) -> bool: ...
     def evict(self, req: Request) -> CacheObject: ...
@@ -142,8 +149,13 @@ class CacheBase:
     """Base class for all cache implementations"""
     def __init__(self, _cache: Cache): ...
     def get(self, req: Request) -> bool: ...
+    def get_batch(
+        self, obj_ids: np.ndarray, obj_sizes: Optional[np.ndarray] = None, clock_times: Optional[np.ndarray] = None
+    ) -> np.ndarray: ...
     def find(self, req: Request, update_cache: bool = True) -> CacheObject: ...
+    def find_or_insert(self, req: Request, update_cache: bool = True) -> tuple[CacheObject | None, bool]: ...
     def can_insert(self, req: Request) -> bool: ...
+    def can_insert_batch(self, obj_ids: np.ndarray, obj_sizes: Optional[np.ndarray] = None) -> np.ndarray: ...
     def insert(self, req: Request) -> CacheObject: ...
     def need_eviction(self, req: Request) -> bool: ...
     def evict(self, req: Request) -> CacheObject: ...
@@ -153,6 +165,14 @@ class CacheBase:
     def get_n_obj(self) -> int: ...
     def print_cache(self) -> str: ...
     def process_trace(self, reader: ReaderProtocol, start_req: int = 0, max_req: int = -1) -> tuple[float, float]: ...
+    def process_trace_callback(
+        self,
+        reader: ReaderProtocol,
+        on_miss: Optional[Callable[[int], None]] = None,
+        batch_report: int = 10000,
+        start_req: int = 0,
+        max_req: int = -1,
+    ) -> tuple[float, float]: ...
     @property
     def cache_size(self) -> int: ...
     @property
@@ -306,10 +326,10 @@ class PluginCache(CacheBase):
         self,
         cache_size: int | float,
         cache_init_hook: Callable,
-        cache_hit_hook: Callable,
+        cache_hit_hook: Optional[Callable],
         cache_miss_hook: Callable,
         cache_eviction_hook: Callable,
-        cache_remove_hook: Callable,
+        cache_remove_hook: Optional[Callable],
         cache_free_hook: Optional[Callable] = None,
         cache_name: str = "PythonHookCache",
         default_ttl: int = 25920000,
@@ -324,6 +344,10 @@ class PluginCache(CacheBase):
 class TraceReader(ReaderProtocol):
     c_reader: bool
     def __init__(self, trace: str, trace_type: TraceType = TraceType.UNKNOWN_TRACE, **kwargs): ...
+    def read_batch(self, obj_ids: np.ndarray, obj_sizes: np.ndarray) -> int: ...
+    def batches(self, batch_size: int = 10000) -> Iterator[tuple[np.ndarray, np.ndarray]]: ...
+    def advise_sequential(self) -> bool: ...
+    def iter_requests(self, copy: bool = True) -> Iterator[Request]: ...
 
 class SyntheticReader(ReaderProtocol):
     c_reader: bool
@@ -338,6 +362,9 @@ class SyntheticReader(ReaderProtocol):
         dist: str = "zipf",
         num_objects: int | None = None,
     ): ...
+    def batches(self, batch_size: int = 10000) -> Iterator[tuple[np.ndarray, np.ndarray]]: ...
+    def read_arrays(self, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]: ...
+    def iter_requests(self, copy: bool = True) -> Iterator[Request]: ...
 
 # Trace generators
 def create_zipf_requests(
@@ -376,6 +403,18 @@ class Util:
     def process_trace(
         cache: CacheBase, reader: ReaderProtocol, start_req: int = 0, max_req: int = -1
     ) -> tuple[float, float]: ...
+    @staticmethod
+    def process_trace_sweep(
+        caches: list[CacheBase],
+        readers: list[ReaderProtocol],
+        start_req: int = 0,
+        max_req: int = -1,
+        max_workers: Optional[int] = None,
+    ) -> list[tuple[float, float]]: ...
+    @staticmethod
+    def process_trace_sharded(
+        caches: list[CacheBase], reader: ReaderProtocol, start_req: int = 0, max_req: int = -1
+    ) -> tuple[float, float]: ...
 
 # Admissioners
 class AdmissionerBase:
@@ -410,3 +449,4 @@ class PluginAdmissioner(AdmissionerBase):
         admissioner_update_hook: Callable,
         admissioner_free_hook: Callable,
     ): ...
+    def flush(self): ...
@@ -54,6 +54,8 @@ class _DataLoader:
         self.cache_dir = Path(cache_dir) if cache_dir else self.DEFAULT_CACHE_DIR
         self.use_auth = use_auth
         self._s3_client = None
+        # Validated local path per key, see _cache_path
+        self._cache_paths: dict[str, Path] = {}
         self._ensure_cache_dir()
 
     def _validate_bucket_name(self, bucket_name: str) -> str:
@@ -155,6 +157,12 @@ class _DataLoader:
 
     def _cache_path(self, key: str) -> Path:
         """Create cache path that mirrors S3 structure after validation."""
+        # Validation and resolve() depend only on the key and cache_dir, so each
+        # key is checked once; whether the file exists is still checked per call
+        cache_path = self._cache_paths.get(key)
+        if cache_path is not None:
+            return cache_path
+
         sanitized_key = self._validate_and_sanitize_key(key)
         cache_path = self.cache_dir / self.bucket_name / sanitized_key
 
@@ -164,6 +172,7 @@ class _DataLoader:
         except ValueError:
             raise ValueError(f"S3 key resolves outside cache directory: {key}")
 
+        self._cache_paths[key] = cache_path
         return cache_path
 
     def _get_object_size(self, key: str) -> int:
@@ -12,6 +12,8 @@ from .libcachesim_python import (
 
 
 class AdmissionerBase(ABC):
+    __slots__ = ("_admissioner",)
+
     _admissioner: Admissioner  # Internal C++ admissioner object
 
     def __init__(self, _admissioner: Admissioner):
@@ -31,12 +33,16 @@ class AdmissionerBase(ABC):
 
 
 class BloomFilterAdmissioner(AdmissionerBase):
+    __slots__ = ()
+
     def __init__(self):
         admissioner = create_bloomfilter_admissioner(None)
         super().__init__(admissioner)
 
 
 class ProbAdmissioner(AdmissionerBase):
+    __slots__ = ()
+
     def __init__(self, prob: float = None):
         params = f"prob={prob}" if prob is not None else None
         admissioner = create_prob_admissioner(params)
@@ -44,6 +50,8 @@ class ProbAdmissioner(AdmissionerBase):
 
 
 class SizeAdmissioner(AdmissionerBase):
+    __slots__ = ()
+
     def __init__(self, size_threshold: int = None):
         params = f"size={size_threshold}" if size_threshold is not None else None
         admissioner = create_size_admissioner(params)
@@ -51,6 +59,8 @@ class SizeAdmissioner(AdmissionerBase):
 
 
 class SizeProbabilisticAdmissioner(AdmissionerBase):
+    __slots__ = ()
+
     def __init__(self, exponent: float = None):
         params = f"exponent={exponent}" if exponent is not None else None
         admissioner = create_size_probabilistic_admissioner(params)
@@ -58,6 +68,8 @@ class SizeProbabilisticAdmissioner(AdmissionerBase):
 
 
 class AdaptSizeAdmissioner(AdmissionerBase):
+    __slots__ = ()
+
     def __init__(self, max_iteration: int = None, reconf_interval: int = None):
         params = ",".join(
             f'{arg}={val}' for arg, val in {
@@ -71,6 +83,8 @@ class AdaptSizeAdmissioner(AdmissionerBase):
 
 
 class PluginAdmissioner(AdmissionerBase):
+    __slots__ = ()
+
     def __init__(self,
                  admissioner_name,
                  admissioner_init_hook,
@@ -86,3 +100,11 @@ class PluginAdmissioner(AdmissionerBase):
             admissioner_update_hook,
             admissioner_free_hook)
         super().__init__(admissioner)
+
+    def flush(self):
+        """Run the free hook on the plugin data without releasing the admissioner
+
+        The free hook runs at most once, so it is not called again when the
+        cache is torn down.
+        """
+        return self._admissioner.flush()
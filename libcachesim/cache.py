@@ -1,6 +1,10 @@
 from abc import ABC
+from itertools import islice
 import logging
 from typing import Callable, Optional
+
+import numpy as np
+
 from .libcachesim_python import (
     CommonCacheParams,
     Request,
@@ -40,6 +44,8 @@ from .libcachesim_python import (
     pypluginCache_init,
     # Process trace function
     c_process_trace,
+    c_process_trace_callback,
+    c_process_requests,
 )
 
 from .admissioner import AdmissionerBase
@@ -48,23 +54,71 @@ from .protocols import ReaderProtocol
 
 logger = logging.getLogger(__name__)
 
+# Requests per C++ call when simulating readers without a C++ backend
+_PROCESS_BATCH_SIZE = 8192
+
+
+def _get_c_reader(reader: ReaderProtocol):
+    """Return the C++ reader backing ``reader``, or None for Python readers"""
+    if not getattr(reader, "c_reader", False):
+        return None
+    try:
+        return reader._reader
+    except AttributeError:
+        raise ValueError("C++ reader missing _reader attribute") from None
+
 
 class CacheBase(ABC):
     """Base class for all cache implementations"""
 
+    __slots__ = ("_cache", "_cache_size", "_cache_name")
+
     _cache: Cache  # Internal C++ cache object
+    # Set by policies that read request fields get_batch leaves at their
+    # defaults (op, next_access_vtime), so Python readers never take the
+    # read_arrays path for them
+    _needs_full_request: bool = False
 
     def __init__(self, _cache: Cache, admissioner: AdmissionerBase = None):
         if admissioner is not None:
             _cache.admissioner = admissioner._admissioner
         self._cache = _cache
+        # Snapshots for the properties; cache_size only changes via set_cache_size
+        self._cache_size = _cache.cache_size
+        self._cache_name = _cache.cache_name
 
     def get(self, req: Request) -> bool:
         return self._cache.get(req)
 
+    def get_batch(
+        self, obj_ids: np.ndarray, obj_sizes: Optional[np.ndarray] = None, clock_times: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Look up a batch of requests in one call and return a boolean hit mask
+
+        Only obj_id, obj_size and clock_time are set on each request, use
+        process_trace for policies that need the full request (e.g., Belady).
+        Without obj_sizes every object has size 1, without clock_times the
+        clock stays at 0.
+        """
+        return self._cache.get_batch(obj_ids, obj_sizes, clock_times)
+
+    def can_insert_batch(self, obj_ids: np.ndarray, obj_sizes: Optional[np.ndarray] = None) -> np.ndarray:
+        """Run can_insert on a batch of requests and return a boolean admit mask
+
+        Requests are built as in get_batch, and nothing is inserted.
+        """
+        return self._cache.can_insert_batch(obj_ids, obj_sizes)
+
     def find(self, req: Request, update_cache: bool = True) -> Optional[CacheObject]:
         return self._cache.find(req, update_cache)
 
+    def find_or_insert(self, req: Request, update_cache: bool = True) -> tuple[Optional[CacheObject], bool]:
+        """Find req, inserting it on a miss (without evicting), in one call
+
+        Returns (obj, inserted).
+        """
+        return self._cache.find_or_insert(req, update_cache)
+
     def can_insert(self, req: Request) -> bool:
         return self._cache.can_insert(req)
 
@@ -91,47 +145,100 @@ class CacheBase(ABC):
 
     def set_cache_size(self, new_size: int) -> None:
         self._cache.set_cache_size(new_size)
+        self._cache_size = self._cache.cache_size
 
     def print_cache(self) -> str:
         return self._cache.print_cache()
 
     def process_trace(self, reader: ReaderProtocol, start_req: int = 0, max_req: int = -1) -> tuple[float, float]:
         """Process trace with this cache and return miss ratios"""
-        if hasattr(reader, "c_reader") and reader.c_reader:
-            # C++ reader with _reader attribute
-            if hasattr(reader, "_reader"):
-                return c_process_trace(self._cache, reader._reader, start_req, max_req)
-            else:
-                raise ValueError("C++ reader missing _reader attribute")
-        else:
-            # Python reader - use Python implementation
-            return self._process_trace_python(reader, start_req, max_req)
+        c_reader = _get_c_reader(reader)
+        if c_reader is not None:
+            return c_process_trace(self._cache, c_reader, start_req, max_req)
+        # Python reader - use Python implementation
+        return self._process_trace_python(reader, start_req, max_req)
+
+    def process_trace_callback(
+        self,
+        reader: ReaderProtocol,
+        on_miss: Optional[Callable[[int], None]] = None,
+        batch_report: int = 10000,
+        start_req: int = 0,
+        max_req: int = -1,
+    ) -> tuple[float, float]:
+        """Process trace like process_trace, calling on_miss(n_miss_so_far) every batch_report requests
+
+        For C++ readers the loop runs in C and only re-enters Python for the callback.
+        """
+        if batch_report <= 0:
+            raise ValueError("batch_report must be positive")
+        c_reader = _get_c_reader(reader)
+        if c_reader is not None:
+            return c_process_trace_callback(self._cache, c_reader, on_miss, batch_report, start_req, max_req)
+        return self._process_trace_python(reader, start_req, max_req, on_miss, batch_report)
 
     def _process_trace_python(
-        self, reader: ReaderProtocol, start_req: int = 0, max_req: int = -1
+        self,
+        reader: ReaderProtocol,
+        start_req: int = 0,
+        max_req: int = -1,
+        on_miss: Optional[Callable[[int], None]] = None,
+        batch_report: int = 10000,
     ) -> tuple[float, float]:
-        """Python fallback for processing traces"""
+        """Python fallback for processing traces
+
+        Requests are pulled from the reader in batches and each batch is
+        simulated by a single C++ call, which copies every request as it is
+        pulled, so readers may refill one Request in place. Readers with a
+        read_arrays method hand over each batch as arrays, so no Request
+        objects are built, unless the policy needs the full request.
+        """
         reader.reset()
-        if start_req > 0:
-            reader.skip_n_req(start_req)
+        read_arrays = None if self._needs_full_request else getattr(reader, "read_arrays", None)
+        if read_arrays is not None:
+            reqs = None
+            if start_req > 0:
+                reader.skip_n_req(start_req)
+        else:
+            # One iterator for the whole trace; iterating the reader again
+            # would rewind it
+            reqs = iter(reader)
+            if start_req > 0:
+                reqs = islice(reqs, start_req, None)
+
+        # With a callback, batches end exactly where a report is due
+        batch_size = batch_report if on_miss is not None else _PROCESS_BATCH_SIZE
 
         n_req = 0
         n_hit = 0
         bytes_req = 0
         bytes_hit = 0
 
-        for req in reader:
-            if not req.valid:
+        cache = self._cache
+        while max_req <= 0 or n_req < max_req:
+            n = batch_size if max_req <= 0 else min(batch_size, max_req - n_req)
+            if read_arrays is not None:
+                obj_ids, obj_sizes, clock_times = read_arrays(n)
+                hits = cache.get_batch(obj_ids, obj_sizes, clock_times)
+                b_req = len(hits)
+                b_hit = int(np.count_nonzero(hits))
+                b_bytes_req = int(obj_sizes.sum())
+                b_bytes_hit = int(obj_sizes[hits].sum())
+            else:
+                # Stops early at the first invalid request
+                b_req, b_hit, b_bytes_req, b_bytes_hit = c_process_requests(cache, reqs, n)
+            if b_req == 0:
                 break
 
-            n_req += 1
-            bytes_req += req.obj_size
+            n_req += b_req
+            n_hit += b_hit
+            bytes_req += b_bytes_req
+            bytes_hit += b_bytes_hit
 
-            if self.get(req):
-                n_hit += 1
-                bytes_hit += req.obj_size
+            if on_miss is not None:
+                on_miss(n_req - n_hit)
 
-            if max_req > 0 and n_req >= max_req:
+            if b_req < n:
                 break
 
         obj_miss_ratio = 1.0 - (n_hit / n_req) if n_req > 0 else 0.0
@@ -141,19 +248,16 @@ class CacheBase(ABC):
     # Properties
     @property
     def cache_size(self) -> int:
-        return self._cache.cache_size
+        return self._cache_size
 
     @property
     def cache_name(self) -> str:
-        return self._cache.cache_name
+        return self._cache_name
 
 
-def _create_common_params(
-    cache_size: int | float, default_ttl: int = 86400 * 300, hashpower: int = 24, consider_obj_metadata: bool = False,
-    reader: ReaderProtocol = None
-) -> CommonCacheParams:
-    """Helper to create common cache parameters.
-    
+def _resolve_cache_size(cache_size: int | float, reader: ReaderProtocol = None) -> int:
+    """Helper to turn ``cache_size`` into bytes.
+
     If ``cache_size`` is provided as a float, it is interpreted as a ratio
     (0 < cache_size <= 1) of the total working set size in bytes as
     returned by ``reader.get_working_set_size()``.
@@ -184,8 +288,20 @@ def _create_common_params(
         )
         cache_size = cache_size_bytes
 
+    return cache_size
+
+
+def _create_common_params(
+    cache_size: int | float, default_ttl: int = 86400 * 300, hashpower: int = 24, consider_obj_metadata: bool = False,
+    reader: ReaderProtocol = None
+) -> CommonCacheParams:
+    """Helper to create common cache parameters.
+
+    See ``_resolve_cache_size`` for how a float ``cache_size`` is handled.
+    Every call returns a new CommonCacheParams, so caches never share one.
+    """
     return CommonCacheParams(
-        cache_size=cache_size,
+        cache_size=_resolve_cache_size(cache_size, reader),
         default_ttl=default_ttl,
         hashpower=hashpower,
         consider_obj_metadata=consider_obj_metadata,
@@ -195,8 +311,15 @@ def _create_common_params(
 # ------------------------------------------------------------------------------------------------
 # Core cache algorithms
 # ------------------------------------------------------------------------------------------------
-class LHD(CacheBase):
-    """Least Hit Density cache (no special parameters)"""
+class _SimpleCache(CacheBase):
+    """Shared constructor for algorithms without cache-specific parameters
+
+    Subclasses only set ``_init_fn`` to their ``*_init`` binding.
+    """
+
+    __slots__ = ()
+
+    _init_fn: Callable[[CommonCacheParams], Cache]
 
     def __init__(
         self,
@@ -208,81 +331,55 @@ class LHD(CacheBase):
         reader: ReaderProtocol = None,
     ):
         super().__init__(
-            _cache=LHD_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
+            _cache=self._init_fn(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
             admissioner=admissioner
         )
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Catch a missing binding when the class is defined, not when first used
+        if not callable(getattr(cls, "_init_fn", None)):
+            raise TypeError(f"{cls.__name__} must set _init_fn to its *_init binding")
+
+
+class LHD(_SimpleCache):
+    """Least Hit Density cache (no special parameters)"""
+
+    __slots__ = ()
+
+    _init_fn = staticmethod(LHD_init)
 
-class LRU(CacheBase):
+
+class LRU(_SimpleCache):
     """Least Recently Used cache (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=LRU_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(LRU_init)
 
 
-class FIFO(CacheBase):
+class FIFO(_SimpleCache):
     """First In First Out cache (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=FIFO_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(FIFO_init)
 
 
-class LFU(CacheBase):
+class LFU(_SimpleCache):
     """Least Frequently Used cache (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=LFU_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
 
+    _init_fn = staticmethod(LFU_init)
 
-class ARC(CacheBase):
+
+class ARC(_SimpleCache):
     """Adaptive Replacement Cache (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=ARC_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(ARC_init)
 
 
 class Clock(CacheBase):
@@ -293,6 +390,8 @@ class Clock(CacheBase):
     n_bit_counter: number of bits for the counter (default: 1)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -314,22 +413,12 @@ class Clock(CacheBase):
         )
 
 
-class Random(CacheBase):
+class Random(_SimpleCache):
     """Random replacement cache (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=Random_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(Random_init)
 
 
 # Advanced algorithms
@@ -342,6 +431,8 @@ class S3FIFO(CacheBase):
     move_to_main_threshold: threshold for moving objects from ghost to main cache (default: 2)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -361,40 +452,20 @@ class S3FIFO(CacheBase):
         )
 
 
-class Sieve(CacheBase):
+class Sieve(_SimpleCache):
     """Sieve cache algorithm (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=Sieve_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(Sieve_init)
 
 
-class LIRS(CacheBase):
+class LIRS(_SimpleCache):
     """Low Inter-reference Recency Set (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=LIRS_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(LIRS_init)
 
     def insert(self, req: Request) -> Optional[CacheObject]:
         return super().insert(req)
@@ -408,6 +479,8 @@ class TwoQ(CacheBase):
     a_out_size_ratio: ratio of Aout queue size to total cache size (default: 0.5)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -429,22 +502,12 @@ class TwoQ(CacheBase):
         )
 
 
-class SLRU(CacheBase):
+class SLRU(_SimpleCache):
     """Segmented LRU (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=SLRU_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(SLRU_init)
 
 
 class WTinyLFU(CacheBase):
@@ -455,6 +518,8 @@ class WTinyLFU(CacheBase):
     window_size: ratio of the window size to the main cache size (default: 0.01)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -484,6 +549,8 @@ class LeCaR(CacheBase):
     lru_weight (float): the initial weight (probability) of the LRU (default: 0.5), 1 - lru_weight = lfu_weight, i.e, the probability of the LRU being selected
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -505,22 +572,12 @@ class LeCaR(CacheBase):
         )
 
 
-class LFUDA(CacheBase):
+class LFUDA(_SimpleCache):
     """LFU with Dynamic Aging (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=LFUDA_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(LFUDA_init)
 
 
 class ClockPro(CacheBase):
@@ -531,6 +588,8 @@ class ClockPro(CacheBase):
     init_ratio_cold: initial ratio of cold pages (default: 1)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -552,41 +611,22 @@ class ClockPro(CacheBase):
         )
 
 
-class Cacheus(CacheBase):
+class Cacheus(_SimpleCache):
     """Cacheus algorithm (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=Cacheus_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(Cacheus_init)
 
 
 # Optimal algorithms
-class Belady(CacheBase):
+class Belady(_SimpleCache):
     """Belady's optimal algorithm (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=Belady_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(Belady_init)
+    _needs_full_request = True
 
 
 class BeladySize(CacheBase):
@@ -596,6 +636,10 @@ class BeladySize(CacheBase):
     n_samples: number of samples for the size consideration (default: 128)
     """
 
+    __slots__ = ()
+
+    _needs_full_request = True
+
     def __init__(
         self,
         cache_size: int | float,
@@ -623,6 +667,8 @@ class LRUProb(CacheBase):
     prob: probability of promoting an object to the head of the queue (default: 0.5)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -653,6 +699,8 @@ class FlashProb(CacheBase):
     disk_cache: the type of the disk cache (default: "FIFO")
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -676,58 +724,28 @@ class FlashProb(CacheBase):
         )
 
 
-class Size(CacheBase):
+class Size(_SimpleCache):
     """Size-based replacement algorithm (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=Size_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(Size_init)
 
 
-class GDSF(CacheBase):
+class GDSF(_SimpleCache):
     """GDSF replacement algorithm (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=GDSF_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(GDSF_init)
 
 
-class Hyperbolic(CacheBase):
+class Hyperbolic(_SimpleCache):
     """Hyperbolic replacement algorithm (no special parameters)"""
 
-    def __init__(
-        self,
-        cache_size: int | float,
-        default_ttl: int = 86400 * 300,
-        hashpower: int = 24,
-        consider_obj_metadata: bool = False,
-        admissioner: AdmissionerBase = None,
-        reader: ReaderProtocol = None,
-    ):
-        super().__init__(
-            _cache=Hyperbolic_init(_create_common_params(cache_size, default_ttl, hashpower, consider_obj_metadata, reader)),
-            admissioner=admissioner
-        )
+    __slots__ = ()
+
+    _init_fn = staticmethod(Hyperbolic_init)
 
 
 # Extra deps
@@ -738,6 +756,8 @@ class ThreeLCache(CacheBase):
     objective: the objective of the ThreeLCache (default: "byte-miss-ratio")
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -779,6 +799,8 @@ class GLCache(CacheBase):
     retrain-intvl: the interval for retraining (default: 86400)
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -820,6 +842,8 @@ class LRB(CacheBase):
     objective: the objective of the LRB (default: "byte-miss-ratio")
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         cache_size: int | float,
@@ -850,16 +874,27 @@ class LRB(CacheBase):
 
 # Plugin cache for custom Python implementations
 class PluginCache(CacheBase):
-    """Python plugin cache for custom implementations"""
+    """Python plugin cache for custom implementations
+
+    The hit, remove and free hooks may be None when the plugin has nothing to
+    do for them; hits then never re-enter Python. The Request passed to the
+    hooks is reused between calls, so copy any fields that must outlive the
+    hook instead of keeping the object.
+    """
+
+    __slots__ = ("common_cache_params",)
+
+    # The hooks may look at any request field
+    _needs_full_request = True
 
     def __init__(
         self,
         cache_size: int | float,
         cache_init_hook: Callable,
-        cache_hit_hook: Callable,
+        cache_hit_hook: Optional[Callable],
         cache_miss_hook: Callable,
         cache_eviction_hook: Callable,
-        cache_remove_hook: Callable,
+        cache_remove_hook: Optional[Callable],
         cache_free_hook: Optional[Callable] = None,
         cache_name: str = "PythonHookCache",
         default_ttl: int = 86400 * 300,
@@ -5,7 +5,6 @@ This module provides functions to generate synthetic traces with different distr
 """
 
 import numpy as np
-import random
 from typing import Optional, Union, Any
 from collections.abc import Iterator
 from .libcachesim_python import Request, ReqOp
@@ -86,10 +85,9 @@ class SyntheticReader(ReaderProtocol):
         # Set the reader type - this is a Python reader, not C++
         self.c_reader = False
 
-        # Set random seed for reproducibility
-        if seed is not None:
-            np.random.seed(seed)
-            random.seed(seed)
+        # Each reader draws from its own generator, so a seeded trace does not
+        # depend on other users of the global numpy state before it is generated
+        self._rng = np.random.RandomState(seed)
 
         # Lazy generation: generate object IDs only when needed
         self._obj_ids: Optional[np.ndarray] = None
@@ -99,9 +97,9 @@ class SyntheticReader(ReaderProtocol):
         """Lazy generation of object ID array"""
         if self._obj_ids is None:
             if self.dist == "zipf":
-                self._obj_ids = _gen_zipf(self.num_objects, self.alpha, self.num_of_req, self.start_obj_id)
+                self._obj_ids = _gen_zipf(self.num_objects, self.alpha, self.num_of_req, self.start_obj_id, self._rng)
             elif self.dist == "uniform":
-                self._obj_ids = _gen_uniform(self.num_objects, self.num_of_req, self.start_obj_id)
+                self._obj_ids = _gen_uniform(self.num_objects, self.num_of_req, self.start_obj_id, self._rng)
         return self._obj_ids
 
     def get_num_of_req(self) -> int:
@@ -211,6 +209,43 @@ class SyntheticReader(ReaderProtocol):
         wss_byte = wss_obj * self.obj_size
         return wss_obj, wss_byte
 
+    def batches(self, batch_size: int = 10000) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Yield the remaining requests as (obj_ids, obj_sizes) arrays
+
+        Each batch holds up to batch_size requests and the read position advances
+        past it. obj_ids is a view into the generated trace, so no ids are copied.
+
+        Args:
+            batch_size: Maximum number of requests per batch
+
+        Returns:
+            Iterator over (obj_ids, obj_sizes) array pairs
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        obj_ids = self.obj_ids
+        # Sizes are constant, so one buffer is sliced for every batch
+        obj_sizes = np.full(batch_size, self.obj_size, dtype=np.int64)
+        while self.current_pos < self.num_of_req:
+            start = self.current_pos
+            stop = min(start + batch_size, self.num_of_req)
+            self.current_pos = stop
+            yield obj_ids[start:stop], obj_sizes[: stop - start]
+
+    def read_arrays(self, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Read up to n requests as (obj_ids, obj_sizes, clock_times) arrays
+
+        The read position advances past the returned requests, and the arrays
+        are empty once the trace is exhausted. obj_ids is a view into the
+        generated trace.
+        """
+        start = self.current_pos
+        stop = min(start + max(n, 0), self.num_of_req)
+        self.current_pos = stop
+        clock_times = np.arange(start, stop, dtype=np.int64) * self.time_span // self.num_of_req
+        return self.obj_ids[start:stop], np.full(stop - start, self.obj_size, dtype=np.int64), clock_times
+
     def __iter__(self) -> Iterator[Request]:
         """Iterator implementation"""
         self.reset()
@@ -226,6 +261,26 @@ class SyntheticReader(ReaderProtocol):
 
         return self.read_one_req()
 
+    def iter_requests(self, copy: bool = True) -> Iterator[Request]:
+        """Iterate over the trace from the beginning
+
+        With copy=False a single Request is refilled in place and yielded for
+        every request, so it must not be kept past the current loop step.
+        """
+        if copy:
+            yield from self
+            return
+        self.reset()
+        req = Request()
+        req.obj_size = self.obj_size
+        req.op = ReqOp.OP_READ
+        req.valid = True
+        for pos, obj_id in enumerate(self.obj_ids.tolist()):
+            req.obj_id = obj_id
+            req.clock_time = pos * self.time_span // self.num_of_req
+            self.current_pos = pos + 1
+            yield req
+
     def __getitem__(self, key: Union[int, slice]) -> Union[Request, SyntheticReaderSliceIterator]:
         """Support index and slice access"""
         if isinstance(key, slice):
@@ -251,7 +306,9 @@ class SyntheticReader(ReaderProtocol):
             raise TypeError("SyntheticReader indices must be integers or slices")
 
 
-def _gen_zipf(m: int, alpha: float, n: int, start: int = 0) -> np.ndarray:
+def _gen_zipf(
+    m: int, alpha: float, n: int, start: int = 0, rng: Optional[np.random.RandomState] = None
+) -> np.ndarray:
     """Generate Zipf-distributed workload.
 
     Args:
@@ -259,6 +316,7 @@ def _gen_zipf(m: int, alpha: float, n: int, start: int = 0) -> np.ndarray:
         alpha: Skewness parameter (alpha >= 0)
         n: Number of requests
         start: Starting object ID
+        rng: Random state to draw from (defaults to the global numpy state)
 
     Returns:
         Array of object IDs following Zipf distribution
@@ -270,7 +328,7 @@ def _gen_zipf(m: int, alpha: float, n: int, start: int = 0) -> np.ndarray:
 
     # Optimization: for alpha=0 (uniform), use uniform distribution directly
     if alpha == 0:
-        return _gen_uniform(m, n, start)
+        return _gen_uniform(m, n, start, rng)
 
     # Calculate Zipf distribution PMF
     np_tmp = np.power(np.arange(1, m + 1), -alpha)
@@ -278,17 +336,18 @@ def _gen_zipf(m: int, alpha: float, n: int, start: int = 0) -> np.ndarray:
     dist_map = np_zeta / np_zeta[-1]
 
     # Generate random samples
-    r = np.random.uniform(0, 1, n)
+    r = (np.random if rng is None else rng).uniform(0, 1, n)
     return np.searchsorted(dist_map, r) + start
 
 
-def _gen_uniform(m: int, n: int, start: int = 0) -> np.ndarray:
+def _gen_uniform(m: int, n: int, start: int = 0, rng: Optional[np.random.RandomState] = None) -> np.ndarray:
     """Generate uniform-distributed workload.
 
     Args:
         m: Number of objects
         n: Number of requests
         start: Starting object ID
+        rng: Random state to draw from (defaults to the global numpy state)
 
     Returns:
         Array of object IDs following uniform distribution
@@ -296,7 +355,7 @@ def _gen_uniform(m: int, n: int, start: int = 0) -> np.ndarray:
     if m <= 0 or n <= 0:
         raise ValueError("num_objects and num_requests must be positive")
     # Optimized: directly generate in the target range for better performance
-    return np.random.randint(start, start + m, n)
+    return (np.random if rng is None else rng).randint(start, start + m, n)
 
 
 class _BaseRequestGenerator:
@@ -323,10 +382,8 @@ class _BaseRequestGenerator:
         self.obj_size = obj_size
         self.time_span = time_span
 
-        # Set random seed
-        if seed is not None:
-            np.random.seed(seed)
-            random.seed(seed)
+        # Draw from a private random state instead of reseeding the global one
+        self._rng = np.random.RandomState(seed)
 
         # Subclasses must implement this method
         self.obj_ids = self._generate_obj_ids(num_objects, num_requests, start_obj_id)
@@ -372,7 +429,7 @@ class _ZipfRequestGenerator(_BaseRequestGenerator):
 
     def _generate_obj_ids(self, num_objects: int, num_requests: int, start_obj_id: int) -> np.ndarray:
         """Generate Zipf-distributed object IDs"""
-        return _gen_zipf(num_objects, self.alpha, num_requests, start_obj_id)
+        return _gen_zipf(num_objects, self.alpha, num_requests, start_obj_id, self._rng)
 
 
 class _UniformRequestGenerator(_BaseRequestGenerator):
@@ -380,7 +437,7 @@ class _UniformRequestGenerator(_BaseRequestGenerator):
 
     def _generate_obj_ids(self, num_objects: int, num_requests: int, start_obj_id: int) -> np.ndarray:
         """Generate uniformly-distributed object IDs"""
-        return _gen_uniform(num_objects, num_requests, start_obj_id)
+        return _gen_uniform(num_objects, num_requests, start_obj_id, self._rng)
 
 
 def create_zipf_requests(
@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 import logging
+from functools import cached_property
 from typing import overload, Union, Optional, Any
 from collections.abc import Iterator
 from urllib.parse import urlparse
 
+import numpy as np
+
 from .protocols import ReaderProtocol
 from .libcachesim_python import (
     TraceType,
@@ -85,10 +88,11 @@ class TraceReaderSliceIterator:
     
     def _simulate_skip(self, n: int) -> None:
         """Simulate skip by reading requests one by one."""
+        # Skipped requests are discarded, so one Request is refilled for all of them
+        req = Request()
+        read_one_req = self.reader._reader.read_one_req
         for _ in range(n):
-            try:
-                self.reader.read_one_req()
-            except RuntimeError:
+            if read_one_req(req) != 0:
                 # If we can't read more, we're at EOF
                 self.current = self.stop  # Mark as done
                 break
@@ -100,6 +104,10 @@ class TraceReader(ReaderProtocol):
     # Mark this as a C++ reader for c_process_trace compatibility
     c_reader: bool = True
 
+    # Request count of the trace, computed on first use since csv/txt
+    # traces are scanned to count it
+    _num_of_req: Optional[int] = None
+
     @overload
     def __init__(self, trace: Reader) -> None: ...
 
@@ -201,11 +209,11 @@ class TraceReader(ReaderProtocol):
     def n_total_req(self) -> int:
         return self._reader.n_total_req
 
-    @property
+    @cached_property
     def trace_path(self) -> str:
         return self._reader.trace_path
 
-    @property
+    @cached_property
     def file_size(self) -> int:
         return self._reader.file_size
 
@@ -213,11 +221,11 @@ class TraceReader(ReaderProtocol):
     def init_params(self) -> ReaderInitParam:
         return self._reader.init_params
 
-    @property
+    @cached_property
     def trace_type(self) -> TraceType:
         return self._reader.trace_type
 
-    @property
+    @cached_property
     def trace_format(self) -> str:
         return self._reader.trace_format
 
@@ -245,11 +253,11 @@ class TraceReader(ReaderProtocol):
     def mmap_offset(self) -> int:
         return self._reader.mmap_offset
 
-    @property
+    @cached_property
     def is_zstd_file(self) -> bool:
         return self._reader.is_zstd_file
 
-    @property
+    @cached_property
     def item_size(self) -> int:
         return self._reader.item_size
 
@@ -309,7 +317,7 @@ class TraceReader(ReaderProtocol):
     def last_req_clock_time(self) -> int:
         return self._reader.last_req_clock_time
 
-    @property
+    @cached_property
     def lcs_ver(self) -> int:
         return self._reader.lcs_ver
 
@@ -322,7 +330,9 @@ class TraceReader(ReaderProtocol):
         return self._reader.read_direction
 
     def get_num_of_req(self) -> int:
-        return self._reader.get_num_of_req()
+        if self._num_of_req is None:
+            self._num_of_req = self._reader.get_num_of_req()
+        return self._num_of_req
 
     def read_one_req(self) -> Request:
         req = Request()
@@ -331,6 +341,42 @@ class TraceReader(ReaderProtocol):
             raise RuntimeError("Failed to read one request")
         return req
 
+    def read_batch(self, obj_ids: np.ndarray, obj_sizes: np.ndarray) -> int:
+        """Fill preallocated uint64 obj_ids and int64 obj_sizes arrays in place
+
+        Returns the number of requests read, which is less than len(obj_ids)
+        only when the end of the trace is reached.
+        """
+        return self._reader.read_batch(obj_ids, obj_sizes)
+
+    def batches(self, batch_size: int = 10000) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Yield the remaining requests as (obj_ids, obj_sizes) arrays
+
+        Each batch holds up to batch_size requests and is filled by one
+        read_batch call. The arrays are views into two buffers that are
+        refilled for every batch, so copy them to keep them past the current
+        loop step.
+
+        Args:
+            batch_size: Maximum number of requests per batch
+
+        Returns:
+            Iterator over (obj_ids, obj_sizes) array pairs
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        obj_ids = np.empty(batch_size, dtype=np.uint64)
+        obj_sizes = np.empty(batch_size, dtype=np.int64)
+        read_batch = self._reader.read_batch
+        while True:
+            n_read = read_batch(obj_ids, obj_sizes)
+            if n_read == 0:
+                return
+            yield obj_ids[:n_read], obj_sizes[:n_read]
+            if n_read < batch_size:
+                return
+
     def reset(self) -> None:
         self._reader.reset()
 
@@ -358,6 +404,15 @@ class TraceReader(ReaderProtocol):
     def set_read_pos(self, pos: float) -> None:
         self._reader.set_read_pos(pos)
 
+    def advise_sequential(self) -> bool:
+        """Ask the kernel to read ahead the memory-mapped trace file
+
+        Huge pages are also requested for the mapping where the kernel
+        supports them. Returns False for traces that are not memory-mapped
+        (csv/txt).
+        """
+        return self._reader.advise_sequential()
+
     def get_working_set_size(self) -> tuple[int, int]:
         return cal_working_set_size(self._reader)
 
@@ -366,7 +421,7 @@ class TraceReader(ReaderProtocol):
         return self
 
     def __len__(self) -> int:
-        return self._reader.get_num_of_req()
+        return self.get_num_of_req()
 
     def __next__(self) -> Request:
         req = Request()
@@ -375,15 +430,30 @@ class TraceReader(ReaderProtocol):
             raise StopIteration
         return req
 
+    def iter_requests(self, copy: bool = True) -> Iterator[Request]:
+        """Iterate over the trace from the beginning
+
+        With copy=False a single Request is refilled in place and yielded for
+        every request, so it must not be kept past the current loop step.
+        """
+        if copy:
+            yield from self
+            return
+        self._reader.reset()
+        req = Request()
+        read_one_req = self._reader.read_one_req
+        while read_one_req(req) == 0:
+            yield req
+
     def __getitem__(self, key: Union[int, slice]) -> Union[Request, TraceReaderSliceIterator]:
         if isinstance(key, slice):
             # Handle slice
-            total_len = self._reader.get_num_of_req()
+            total_len = self.get_num_of_req()
             start, stop, step = key.indices(total_len)
             return TraceReaderSliceIterator(self, start, stop, step)
         elif isinstance(key, int):
             # Handle single index
-            total_len = self._reader.get_num_of_req()
+            total_len = self.get_num_of_req()
             if key < 0:
                 key += total_len
             if key < 0 or key >= total_len:
@@ -415,10 +485,10 @@ class TraceReader(ReaderProtocol):
     
     def _simulate_skip_single(self, n: int) -> None:
         """Simulate skip by reading requests one by one for single index access."""
+        req = Request()
+        read_one_req = self._reader.read_one_req
         for i in range(n):
-            req = Request()
-            ret = self._reader.read_one_req(req)
-            if ret != 0:
+            if read_one_req(req) != 0:
                 raise IndexError(f"Cannot skip to position, reached EOF at {i}")
     
     # Note: Removed old inefficient methods _can_use_skip_n_req and _simulate_skip_and_read_single
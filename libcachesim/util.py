@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Sequence
 
 if TYPE_CHECKING:
     from .protocols import ReaderProtocol
     from .cache import CacheBase
 
-from .libcachesim_python import convert_to_oracleGeneral, convert_to_lcs, c_process_trace
+from .libcachesim_python import convert_to_oracleGeneral, convert_to_lcs, c_process_trace, c_process_trace_shard
 
 
 class Util:
@@ -51,3 +52,89 @@ class Util:
             raise ValueError("Reader must be a C++ reader")
 
         return c_process_trace(cache._cache, reader._reader, start_req, max_req)
+
+    @staticmethod
+    def process_trace_sweep(
+        caches: Sequence[CacheBase],
+        readers: Sequence[ReaderProtocol],
+        start_req: int = 0,
+        max_req: int = -1,
+        max_workers: Optional[int] = None,
+    ) -> list[tuple[float, float]]:
+        """
+        Process a trace with several independent caches in parallel threads.
+
+        The C++ simulation releases the GIL, so C++ readers scale across cores.
+        Readers keep a read position, so every cache needs its own reader
+        (e.g. reader.clone()).
+
+        Args:
+            caches: The caches to process the trace with.
+            readers: One reader per cache.
+            start_req: The starting request to process.
+            max_req: The maximum number of requests to process.
+            max_workers: The number of threads, defaults to ThreadPoolExecutor's choice.
+
+        Returns:
+            list[tuple[float, float]]: The object and byte miss ratio of each cache, in order.
+        """
+        if len(caches) != len(readers):
+            raise ValueError("caches and readers must have the same length")
+        if len({id(reader) for reader in readers}) != len(readers):
+            raise ValueError("Each cache needs its own reader")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(cache.process_trace, reader, start_req, max_req)
+                for cache, reader in zip(caches, readers)
+            ]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def process_trace_sharded(
+        caches: Sequence[CacheBase],
+        reader: ReaderProtocol,
+        start_req: int = 0,
+        max_req: int = -1,
+    ) -> tuple[float, float]:
+        """
+        Process a trace split by object hash across independent caches in parallel threads.
+
+        Shard i of len(caches) holds the objects whose hash falls into it, so
+        every object is served by exactly one cache. The combined miss ratio
+        only approximates a single cache of the total size: it is close for
+        policies whose decisions are local to an object (e.g. LRU, FIFO) and
+        can differ for policies with global state (e.g. ARC, Belady). Size
+        each cache for its share of the trace.
+
+        Every shard reads the whole trace through its own temporary clone of
+        the reader and skips the other shards' requests, so reading costs
+        O(len(caches) * trace length) in total; only the cache work is split.
+
+        Args:
+            caches: One cache per shard.
+            reader: The C++ reader to read the trace from.
+            start_req: The starting request to process.
+            max_req: The maximum number of trace requests to process.
+
+        Returns:
+            tuple[float, float]: The combined object miss ratio and byte miss ratio.
+        """
+        if not getattr(reader, "c_reader", False):
+            raise ValueError("Reader must be a C++ reader")
+        if not caches:
+            raise ValueError("At least one cache is required")
+
+        n_shards = len(caches)
+        c_reader = reader._reader
+        with ThreadPoolExecutor(max_workers=n_shards) as executor:
+            futures = [
+                executor.submit(c_process_trace_shard, cache._cache, c_reader, shard, n_shards, start_req, max_req)
+                for shard, cache in enumerate(caches)
+            ]
+            counts = [future.result() for future in futures]
+
+        n_req, n_hit, bytes_req, bytes_hit = (sum(column) for column in zip(*counts))
+        obj_miss_ratio = 1.0 - n_hit / n_req if n_req > 0 else 0.0
+        byte_miss_ratio = 1.0 - bytes_hit / bytes_req if bytes_req > 0 else 0.0
+        return obj_miss_ratio, byte_miss_ratio
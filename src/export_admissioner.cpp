@@ -25,6 +25,7 @@ pypluginAdmissioner_params {
   py::function admissioner_update_hook;
   py::function admissioner_free_hook;
   std::string admissioner_name;
+  bool freed = false;  ///< free hook already ran (via flush or teardown)
 } pypluginAdmissioner_params_t;
 
 static bool pypluginAdmissioner_admit(admissioner_t *, const request_t *);
@@ -36,7 +37,7 @@ static void pypluginAdmissioner_update(admissioner_t *, const request_t *,
 struct PypluginAdmissionerParamsDeleter {
   void operator()(pypluginAdmissioner_params_t *ptr) const {
     if (ptr != nullptr) {
-      if (!ptr->admissioner_free_hook.is_none()) {
+      if (!ptr->freed && !ptr->admissioner_free_hook.is_none()) {
         try {
           ptr->admissioner_free_hook(ptr->data);
         } catch (...) { }
@@ -91,26 +92,35 @@ admissioner_t *create_plugin_admissioner(std::string admissioner_name,
 
 static bool pypluginAdmissioner_admit(admissioner_t *admissioner,
                                       const request_t *req) {
+  py::gil_scoped_acquire acquire;
   pypluginAdmissioner_params_t *params =
       (pypluginAdmissioner_params_t *)admissioner->params;
   return params->admissioner_admit_hook(params->data, req).cast<bool>();
 }
 
 static admissioner_t *pypluginAdmissioner_clone(admissioner_t *admissioner) {
+  py::gil_scoped_acquire acquire;
   pypluginAdmissioner_params_t *params =
       (pypluginAdmissioner_params_t *)admissioner->params;
   return params->admissioner_clone_hook(params->data).cast<admissioner_t *>();
 }
 
 static void pypluginAdmissioner_free(admissioner_t *admissioner) {
+  py::gil_scoped_acquire acquire;
   pypluginAdmissioner_params_t *params =
       (pypluginAdmissioner_params_t *)admissioner->params;
+  // The free hook runs once, whether flush() or cache teardown comes first
+  if (params->freed) {
+    return;
+  }
+  params->freed = true;
   params->admissioner_free_hook(params->data);
 }
 
 static void pypluginAdmissioner_update(admissioner_t *admissioner,
                                        const request_t *req,
                                        const uint64_t cache_size) {
+  py::gil_scoped_acquire acquire;
   pypluginAdmissioner_params_t *params =
       (pypluginAdmissioner_params_t *)admissioner->params;
   params->admissioner_update_hook(params->data, req, cache_size);
@@ -196,10 +206,21 @@ void export_admissioner(py::module &m) {
              self.update(&self, req, cache_size);
            })
 
-      .def("free", [](admissioner_t &self) {
-        if (!self.free)
-          throw std::runtime_error("free function pointer is NULL");
-        self.free(&self);
+      .def("free",
+           [](admissioner_t &self) {
+             if (!self.free)
+               throw std::runtime_error("free function pointer is NULL");
+             self.free(&self);
+           })
+
+      .def("flush", [](admissioner_t &self) {
+        // Runs the plugin's free hook now but keeps the admissioner alive,
+        // so results can be reported without relying on cache teardown; the
+        // hook is then skipped at teardown
+        if (self.admit != pypluginAdmissioner_admit)
+          throw std::runtime_error(
+              "flush is only supported by plugin admissioners");
+        pypluginAdmissioner_free(&self);
       });
   // ***********************************************************************
   // ****                                                               ****
@@ -7,14 +7,19 @@
 // https://github.com/1a1a11a/libcachesim/blob/develop/LICENSE
 
 #include <pybind11/functional.h>
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include <algorithm>
 #include <iostream>
 #include <memory>
+#include <optional>
 #include <sstream>
+#include <vector>
 
 #include "config.h"
+#include "dataStructure/hash/hash.h"
 #include "dataStructure/hashtable/hashtable.h"
 #include "export.h"
 #include "libCacheSim/cache.h"
@@ -57,6 +62,12 @@ struct RequestDeleter {
   }
 };
 
+struct ReaderDeleter {
+  void operator()(reader_t* ptr) const {
+    if (ptr != nullptr) close_trace(ptr);
+  }
+};
+
 // ***********************************************************************
 // ****             Python plugin cache implementation BEGIN          ****
 // ***********************************************************************
@@ -67,12 +78,19 @@ struct pypluginCache_params;
 typedef struct __attribute__((visibility("hidden"))) pypluginCache_params {
   py::object data;  ///< Plugin's internal data structure (python object)
   py::function cache_init_hook;
-  py::function cache_hit_hook;
+  py::object cache_hit_hook;  ///< may be None
   py::function cache_miss_hook;
   py::function cache_eviction_hook;
-  py::function cache_remove_hook;
-  py::function cache_free_hook;
+  py::object cache_remove_hook;  ///< may be None
+  py::object cache_free_hook;    ///< may be None
   std::string cache_name;
+  /// Hooks get (data, req) through one prebuilt tuple whose req wraps this
+  /// scratch copy of the current request, so a hook call allocates neither a
+  /// Request wrapper nor an argument tuple. Declared before the handles below
+  /// so they are released first.
+  std::unique_ptr<request_t, RequestDeleter> req_buf;
+  py::object req_obj;
+  py::tuple hook_args;
 } pypluginCache_params_t;
 
 // Custom deleter for pypluginCache_params_t
@@ -102,11 +120,24 @@ static cache_obj_t* pypluginCache_to_evict(cache_t* cache,
 static void pypluginCache_evict(cache_t* cache, const request_t* req);
 static bool pypluginCache_remove(cache_t* cache, const obj_id_t obj_id);
 
+// Calls hook(data, req) with the preallocated arguments, GIL must be held.
+// The Request passed to the hook is only valid for the duration of the call.
+static py::object pypluginCache_call_hook(pypluginCache_params_t* params,
+                                          const py::object& hook,
+                                          const request_t* req) {
+  copy_request(params->req_buf.get(), req);
+  PyObject* ret = PyObject_Call(hook.ptr(), params->hook_args.ptr(), nullptr);
+  if (ret == nullptr) {
+    throw py::error_already_set();
+  }
+  return py::reinterpret_steal<py::object>(ret);
+}
+
 cache_t* pypluginCache_init(
     const common_cache_params_t ccache_params, std::string cache_name,
-    py::function cache_init_hook, py::function cache_hit_hook,
+    py::function cache_init_hook, py::object cache_hit_hook,
     py::function cache_miss_hook, py::function cache_eviction_hook,
-    py::function cache_remove_hook, py::function cache_free_hook) {
+    py::object cache_remove_hook, py::object cache_free_hook) {
   py::gil_scoped_acquire acquire;
   // Initialize base cache structure with exception safety
   cache_t* cache = nullptr;
@@ -147,6 +178,10 @@ cache_t* pypluginCache_init(
 
     // Initialize the cache data - this might throw
     params->data = cache_init_hook(ccache_params);
+    params->req_buf.reset(new_request());
+    params->req_obj =
+        py::cast(params->req_buf.get(), py::return_value_policy::reference);
+    params->hook_args = py::make_tuple(params->data, params->req_obj);
 
     // Transfer ownership to the cache structure
     cache->eviction_params = params.release();
@@ -185,16 +220,17 @@ static void pypluginCache_free(cache_t* cache) {
 
 static bool pypluginCache_get(cache_t* cache, const request_t* req) {
   bool hit = cache_get_base(cache, req);
-  py::gil_scoped_acquire acquire;
   pypluginCache_params_t* params =
       (pypluginCache_params_t*)cache->eviction_params;
-
-  if (hit) {
-    params->cache_hit_hook(params->data, req);
-  } else {
-    params->cache_miss_hook(params->data, req);
+  // is_none() only compares pointers, so it is safe without the GIL
+  if (hit && params->cache_hit_hook.is_none()) {
+    return hit;
   }
 
+  py::gil_scoped_acquire acquire;
+  pypluginCache_call_hook(
+      params, hit ? params->cache_hit_hook : params->cache_miss_hook, req);
+
   return hit;
 }
 
@@ -218,7 +254,8 @@ static void pypluginCache_evict(cache_t* cache, const request_t* req) {
       (pypluginCache_params_t*)cache->eviction_params;
 
   // Get eviction candidate from plugin
-  py::object result = params->cache_eviction_hook(params->data, req);
+  py::object result =
+      pypluginCache_call_hook(params, params->cache_eviction_hook, req);
   obj_id_t obj_id = result.cast<obj_id_t>();
 
   // Find the object in the cache
@@ -238,7 +275,9 @@ static bool pypluginCache_remove(cache_t* cache, const obj_id_t obj_id) {
       (pypluginCache_params_t*)cache->eviction_params;
 
   // Notify plugin of the removal
-  params->cache_remove_hook(params->data, obj_id);
+  if (!params->cache_remove_hook.is_none()) {
+    params->cache_remove_hook(params->data, obj_id);
+  }
 
   // Find the object in the cache
   cache_obj_t* obj = hashtable_find_obj_id(cache->hashtable, obj_id);
@@ -255,6 +294,26 @@ static bool pypluginCache_remove(cache_t* cache, const obj_id_t obj_id) {
 // ****            Python plugin cache implementation END             ****
 // ***********************************************************************
 
+// Converts the result of cache->find for Python: None when not found
+static py::object found_obj_to_py(cache_obj_t* obj, const request_t& req) {
+  if (obj == nullptr) {
+    return py::none();
+  }
+  // NOTE(haocheng): For LHD only, return a dummy object for hit
+  if (obj == LHD_HIT_MARKER) {
+    cache_obj_t* dummy_obj =
+        static_cast<cache_obj_t*>(calloc(1, sizeof(cache_obj_t)));
+    if (dummy_obj == nullptr) {
+      throw std::bad_alloc();
+    }
+    dummy_obj->obj_id = req.obj_id;
+    dummy_obj->obj_size = req.obj_size;
+    return py::cast(
+        std::unique_ptr<cache_obj_t, CacheObjectDeleter>(dummy_obj));
+  }
+  return py::cast(obj, py::return_value_policy::reference);
+}
+
 // Templates
 template <cache_t* (*InitFn)(common_cache_params_t, const char*)>
 auto make_cache_wrapper(const std::string& fn_name) {
@@ -291,28 +350,120 @@ void export_cache(py::module& m) {
             return self.get(&self, &req);
           },
           "req"_a)
+      .def(
+          "get_batch",
+          [](cache_t& self,
+             py::array_t<obj_id_t, py::array::c_style | py::array::forcecast>
+                 obj_ids,
+             std::optional<py::array_t<int64_t, py::array::c_style |
+                                                    py::array::forcecast>>
+                 obj_sizes,
+             std::optional<py::array_t<int64_t, py::array::c_style |
+                                                    py::array::forcecast>>
+                 clock_times) {
+            const py::ssize_t n = obj_ids.shape(0);
+            if (obj_ids.ndim() != 1 ||
+                (obj_sizes &&
+                 (obj_sizes->ndim() != 1 || obj_sizes->shape(0) != n)) ||
+                (clock_times &&
+                 (clock_times->ndim() != 1 || clock_times->shape(0) != n))) {
+              throw std::invalid_argument(
+                  "obj_ids, obj_sizes and clock_times must be 1-D arrays of "
+                  "the same length");
+            }
+            py::array_t<bool> hits(n);
+            const obj_id_t* ids = obj_ids.data();
+            // Without sizes every object counts as one unit
+            const int64_t* sizes = obj_sizes ? obj_sizes->data() : nullptr;
+            const int64_t* times =
+                clock_times ? clock_times->data() : nullptr;
+            bool* out = hits.mutable_data();
+
+            // Only obj_id, obj_size and clock_time are filled in, so policies
+            // that need other request fields (e.g. Belady) should use
+            // c_process_trace
+            std::unique_ptr<request_t, RequestDeleter> req(new_request());
+            req->obj_size = 1;
+            {
+              py::gil_scoped_release release;
+              for (py::ssize_t i = 0; i < n; i++) {
+                req->obj_id = ids[i];
+                // The request is reused, so drop the previous object's hash
+                req->hv = 0;
+                if (sizes != nullptr) {
+                  req->obj_size = sizes[i];
+                }
+                if (times != nullptr) {
+                  req->clock_time = times[i];
+                }
+                out[i] = self.get(&self, req.get());
+              }
+            }
+            return hits;
+          },
+          "obj_ids"_a, "obj_sizes"_a = py::none(),
+          "clock_times"_a = py::none())
+      .def(
+          "can_insert_batch",
+          [](cache_t& self,
+             py::array_t<obj_id_t, py::array::c_style | py::array::forcecast>
+                 obj_ids,
+             std::optional<py::array_t<int64_t, py::array::c_style |
+                                                    py::array::forcecast>>
+                 obj_sizes) {
+            const py::ssize_t n = obj_ids.shape(0);
+            if (obj_ids.ndim() != 1 ||
+                (obj_sizes &&
+                 (obj_sizes->ndim() != 1 || obj_sizes->shape(0) != n))) {
+              throw std::invalid_argument(
+                  "obj_ids and obj_sizes must be 1-D arrays of the same "
+                  "length");
+            }
+            py::array_t<bool> admits(n);
+            const obj_id_t* ids = obj_ids.data();
+            const int64_t* sizes = obj_sizes ? obj_sizes->data() : nullptr;
+            bool* out = admits.mutable_data();
+
+            // Same request fields as get_batch; the cache is not modified
+            // unless the admissioner itself keeps state
+            std::unique_ptr<request_t, RequestDeleter> req(new_request());
+            req->obj_size = 1;
+            {
+              py::gil_scoped_release release;
+              for (py::ssize_t i = 0; i < n; i++) {
+                req->obj_id = ids[i];
+                req->hv = 0;
+                if (sizes != nullptr) {
+                  req->obj_size = sizes[i];
+                }
+                out[i] = self.can_insert(&self, req.get());
+              }
+            }
+            return admits;
+          },
+          "obj_ids"_a, "obj_sizes"_a = py::none())
       .def(
           "find",
           [](cache_t& self, const request_t& req,
              const bool update_cache) -> py::object {
+            return found_obj_to_py(self.find(&self, &req, update_cache), req);
+          },
+          "req"_a, "update_cache"_a = true)
+      .def(
+          "find_or_insert",
+          [](cache_t& self, const request_t& req,
+             const bool update_cache) -> py::tuple {
             cache_obj_t* obj = self.find(&self, &req, update_cache);
-            // Return None if obj is null (not found)
-            if (obj == nullptr) {
-              return py::none();
-            }
-            // NOTE(haocheng): For LHD only, return a dummy object for hit
-            if (obj == LHD_HIT_MARKER) {
-              cache_obj_t* dummy_obj =
-                  static_cast<cache_obj_t*>(calloc(1, sizeof(cache_obj_t)));
-              if (dummy_obj == nullptr) {
-                throw std::bad_alloc();
-              }
-              dummy_obj->obj_id = req.obj_id;
-              dummy_obj->obj_size = req.obj_size;
-              return py::cast(
-                  std::unique_ptr<cache_obj_t, CacheObjectDeleter>(dummy_obj));
+            if (obj != nullptr) {
+              return py::make_tuple(found_obj_to_py(obj, req), false);
             }
-            return py::cast(obj, py::return_value_policy::reference);
+            // Like insert, this does not evict; check need_eviction first
+            cache_obj_t* inserted = self.insert(&self, &req);
+            py::object inserted_obj =
+                inserted == nullptr
+                    ? py::none()
+                    : py::cast(inserted, py::return_value_policy::reference);
+            return py::make_tuple(inserted_obj, true);
           },
           "req"_a, "update_cache"_a = true)
       .def(
@@ -581,6 +732,157 @@ void export_cache(py::module& m) {
       },
       "cache"_a, "reader"_a, "start_req"_a = 0, "max_req"_a = -1,
       py::call_guard<py::gil_scoped_release>());
+
+  m.def(
+      "c_process_requests",
+      [](cache_t& cache, py::iterator reqs, int64_t n) {
+        // Pull up to n requests and copy each one as it arrives: a reader may
+        // refill the same Request object for every step. The simulation then
+        // runs on the copies without the GIL
+        std::vector<request_t> batch;
+        batch.reserve(static_cast<size_t>(std::max<int64_t>(n, 0)));
+        while (static_cast<int64_t>(batch.size()) < n) {
+          // PyIter_Next rather than py::iterator's operator++, which would
+          // fetch one request past the batch
+          py::object item =
+              py::reinterpret_steal<py::object>(PyIter_Next(reqs.ptr()));
+          if (!item) {
+            if (PyErr_Occurred()) {
+              throw py::error_already_set();
+            }
+            break;
+          }
+          const request_t& req = item.cast<const request_t&>();
+          if (!req.valid) {
+            break;  // an invalid request marks the end of the trace
+          }
+          batch.push_back(req);
+        }
+
+        int64_t n_hit = 0;
+        int64_t bytes_req = 0, bytes_hit = 0;
+        {
+          py::gil_scoped_release release;
+          for (request_t& req : batch) {
+            bytes_req += req.obj_size;
+            if (cache.get(&cache, &req)) {
+              n_hit += 1;
+              bytes_hit += req.obj_size;
+            }
+          }
+        }
+        return std::make_tuple(static_cast<int64_t>(batch.size()), n_hit,
+                               bytes_req, bytes_hit);
+      },
+      "cache"_a, "reqs"_a, "n"_a);
+
+  m.def(
+      "c_process_trace_shard",
+      [](cache_t& cache, const reader_t& reader, int64_t shard,
+         int64_t n_shards, int64_t start_req = 0, int64_t max_req = -1) {
+        if (n_shards <= 0 || shard < 0 || shard >= n_shards) {
+          throw std::invalid_argument("shard must be in [0, n_shards)");
+        }
+
+        // Each shard reads through its own clone, closed on return; cloned
+        // while holding the GIL so concurrent shards never clone at once
+        std::unique_ptr<reader_t, ReaderDeleter> shard_reader(
+            clone_reader(&reader));
+        if (shard_reader == nullptr) {
+          throw std::runtime_error("Failed to clone reader");
+        }
+
+        std::unique_ptr<request_t, RequestDeleter> req(new_request());
+        int64_t n_read = 0, n_req = 0, n_hit = 0;
+        int64_t bytes_req = 0, bytes_hit = 0;
+
+        {
+          py::gil_scoped_release release;
+          reset_reader(shard_reader.get());
+          if (start_req > 0) {
+            skip_n_req(shard_reader.get(), start_req);
+          }
+
+          read_one_req(shard_reader.get(), req.get());
+          while (req->valid) {
+            n_read += 1;
+            // The hashtable indexes buckets by the low bits of this hash, so
+            // shard on the high bits to keep every shard's buckets spread out
+            uint64_t hv = get_hash_value_int_64(&req->obj_id);
+            if ((hv >> 32) % (uint64_t)n_shards == (uint64_t)shard) {
+              n_req += 1;
+              bytes_req += req->obj_size;
+              if (cache.get(&cache, req.get())) {
+                n_hit += 1;
+                bytes_hit += req->obj_size;
+              }
+            }
+            read_one_req(shard_reader.get(), req.get());
+            if (max_req > 0 && n_read >= max_req) {
+              break;  // max_req counts trace requests, not shard requests
+            }
+          }
+        }
+
+        return std::make_tuple(n_req, n_hit, bytes_req, bytes_hit);
+      },
+      "cache"_a, "reader"_a, "shard"_a, "n_shards"_a, "start_req"_a = 0,
+      "max_req"_a = -1);
+
+  m.def(
+      "c_process_trace_callback",
+      [](cache_t& cache, reader_t& reader, py::object on_miss,
+         int64_t batch_report = 10000, int64_t start_req = 0,
+         int64_t max_req = -1) {
+        if (batch_report <= 0) {
+          throw std::invalid_argument("batch_report must be positive");
+        }
+        bool has_callback = !on_miss.is_none();
+
+        std::unique_ptr<request_t, RequestDeleter> req(new_request());
+        int64_t n_req = 0, n_hit = 0;
+        int64_t bytes_req = 0, bytes_hit = 0;
+        bool hit;
+
+        {
+          py::gil_scoped_release release;
+          reset_reader(&reader);
+          if (start_req > 0) {
+            skip_n_req(&reader, start_req);
+          }
+
+          read_one_req(&reader, req.get());
+          while (req->valid) {
+            n_req += 1;
+            bytes_req += req->obj_size;
+            hit = cache.get(&cache, req.get());
+            if (hit) {
+              n_hit += 1;
+              bytes_hit += req->obj_size;
+            }
+            if (has_callback && n_req % batch_report == 0) {
+              // only hold the GIL for the upcall itself
+              py::gil_scoped_acquire acquire;
+              on_miss(n_req - n_hit);
+            }
+            read_one_req(&reader, req.get());
+            if (max_req > 0 && n_req >= max_req) {
+              break;  // Stop if we reached the max request limit
+            }
+          }
+        }
+
+        // report the final count if the last batch was partial
+        if (has_callback && n_req % batch_report != 0) {
+          on_miss(n_req - n_hit);
+        }
+        double obj_miss_ratio = n_req > 0 ? 1.0 - (double)n_hit / n_req : 0.0;
+        double byte_miss_ratio =
+            bytes_req > 0 ? 1.0 - (double)bytes_hit / bytes_req : 0.0;
+        return std::make_tuple(obj_miss_ratio, byte_miss_ratio);
+      },
+      "cache"_a, "reader"_a, "on_miss"_a = py::none(),
+      "batch_report"_a = 10000, "start_req"_a = 0, "max_req"_a = -1);
 }
 
 }  // namespace libcachesim
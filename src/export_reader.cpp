@@ -9,6 +9,7 @@
 #include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <sys/mman.h>
 
 #include <iostream>
 #include <memory>
@@ -70,7 +71,7 @@ void export_reader(py::module& m) {
         cal_working_set_size(&reader, &wss_obj, &wss_byte);
         return std::make_tuple(wss_obj, wss_byte);
       },
-      "reader"_a);
+      "reader"_a, py::call_guard<py::gil_scoped_release>());
 
   // Sampler type enumeration
   py::enum_<sampler_type>(m, "SamplerType")
@@ -272,8 +273,13 @@ void export_reader(py::module& m) {
       // TODO(haocheng): Fully support sampler in Python bindings
       .def_readonly("sampler", &reader_t::sampler)
       .def_readonly("read_direction", &reader_t::read_direction)
-      .def("get_num_of_req",
-           [](reader_t& self) { return get_num_of_req(&self); })
+      // Calls that may scan the whole trace (csv/txt/zstd) release the GIL so
+      // readers on other threads keep running; read_one_req keeps it, since
+      // releasing per request would cost more than decoding one record
+      .def(
+          "get_num_of_req",
+          [](reader_t& self) { return get_num_of_req(&self); },
+          py::call_guard<py::gil_scoped_release>())
       .def(
           "read_one_req",
           [](reader_t& self, request_t& req) {
@@ -282,6 +288,37 @@ void export_reader(py::module& m) {
             return ret;
           },
           "req"_a)
+      .def(
+          "read_batch",
+          [](reader_t& self, py::array_t<obj_id_t, py::array::c_style> obj_ids,
+             py::array_t<int64_t, py::array::c_style> obj_sizes) {
+            if (obj_ids.ndim() != 1 || obj_sizes.ndim() != 1 ||
+                obj_ids.shape(0) != obj_sizes.shape(0)) {
+              throw std::invalid_argument(
+                  "obj_ids and obj_sizes must be 1-D arrays of the same "
+                  "length");
+            }
+            const py::ssize_t n = obj_ids.shape(0);
+            obj_id_t* ids = obj_ids.mutable_data();
+            int64_t* sizes = obj_sizes.mutable_data();
+
+            // Fill the caller's buffers in place and return how many
+            // requests were read; fewer than len(obj_ids) means end of trace
+            py::ssize_t n_read = 0;
+            request_t* req = new_request();
+            {
+              py::gil_scoped_release release;
+              while (n_read < n && read_one_req(&self, req) == 0 &&
+                     req->valid) {
+                ids[n_read] = req->obj_id;
+                sizes[n_read] = req->obj_size;
+                n_read++;
+              }
+            }
+            free_request(req);
+            return n_read;
+          },
+          py::arg("obj_ids").noconvert(), py::arg("obj_sizes").noconvert())
       .def("reset", [](reader_t& self) { reset_reader(&self); })
       .def("close", [](reader_t& self) { close_reader(&self); })
       .def("clone",
@@ -313,7 +350,7 @@ void export_reader(py::module& m) {
             // Return the actual number of requests skipped
             return count;
           },
-          "n"_a)
+          "n"_a, py::call_guard<py::gil_scoped_release>())
       .def("read_one_req_above",
            [](reader_t& self) {
              request_t* req = new_request();
@@ -334,6 +371,24 @@ void export_reader(py::module& m) {
       .def(
           "set_read_pos",
           [](reader_t& self, double pos) { reader_set_read_pos(&self, pos); },
-          "pos"_a);
+          "pos"_a)
+      .def("advise_sequential", [](reader_t& self) {
+        // Only binary traces are memory-mapped; csv/txt traces go through stdio
+        if (self.mapped_file == nullptr) {
+          return false;
+        }
+        // madvise advice values are not bit flags, so each one is issued on
+        // its own: read ahead aggressively and start faulting pages in now
+        bool ok =
+            madvise(self.mapped_file, self.file_size, MADV_SEQUENTIAL) == 0;
+        ok = madvise(self.mapped_file, self.file_size, MADV_WILLNEED) == 0 &&
+             ok;
+#ifdef MADV_HUGEPAGE
+        // Best effort: fewer TLB misses on large traces where the kernel
+        // supports huge pages for file mappings, so failure is ignored
+        madvise(self.mapped_file, self.file_size, MADV_HUGEPAGE);
+#endif
+        return ok;
+      });
 }
 }  // namespace libcachesim
@@ -4,6 +4,7 @@ Test cases for cache admission in libCacheSim Python bindings.
 This module tests the PluginAdmissioner and existing admission policies
 """
 
+import numpy as np
 import pytest
 from libcachesim import (
     SizeAdmissioner,
@@ -66,6 +67,23 @@ class TestSizeAdmissioner:
         # All items admitted should lie within the size threshold
         assert admits == thresh
 
+    @pytest.mark.parametrize("thresh", [0, 100, 1000])
+    def test_can_insert_batch(self, thresh):
+        cache = LRU(
+            cache_size=1000,
+            admissioner=SizeAdmissioner(size_threshold=thresh)
+        )
+
+        # Same requests as above, passed as one pair of arrays
+        obj_sizes = np.arange(1000, dtype=np.int64)
+        admits = cache.can_insert_batch(obj_sizes.astype(np.uint64), obj_sizes)
+        assert admits.dtype == np.bool_
+        assert admits.tolist() == (obj_sizes < thresh).tolist()
+        assert cache.get_n_obj() == 0
+
+        with pytest.raises(ValueError):
+            cache.can_insert_batch(obj_sizes.astype(np.uint64), obj_sizes[:-1])
+
 
 class TestProbAdmissioner:
     """test existing probabilistic admissioner policy"""
@@ -253,3 +271,32 @@ class TestPluginAdmissioner:
         # Same correctness criteria as `TestSizeAdmissioner`
         assert admits == thresh
         del cache
+
+    def test_flush(self):
+        flushed = []
+        pa = PluginAdmissioner(
+            "testAdmissioner",
+            lambda: {"seen": 0},
+            lambda data, req: data.update(seen=data["seen"] + 1) or True,
+            lambda: None,
+            lambda data, req, cache_size: None,
+            lambda data: flushed.append(data["seen"]),
+        )
+        cache = LRU(cache_size=1000, admissioner=pa)
+
+        for obj_id in range(10):
+            req = Request()
+            req.obj_id = obj_id
+            req.obj_size = 1
+            req.op = ReqOp.OP_GET
+            cache.get(req)
+
+        # flush reports the plugin state while the admissioner stays usable
+        pa.flush()
+        assert flushed == [10]
+        assert cache.can_insert(req)
+
+        # The free hook does not run a second time
+        pa.flush()
+        del cache
+        assert flushed == [10]
@@ -1,12 +1,14 @@
 from libcachesim import TraceAnalyzer, TraceReader, AnalysisOption, AnalysisParam
-import os
 import pytest
 
 
-def test_analyzer_common():
+def test_analyzer_common(tmp_path, monkeypatch):
     """
     Test the trace analyzer functionality.
     """
+    # The analyzer writes its results (and a "stat" file) into the working
+    # directory, so run in a temporary one that pytest removes afterwards
+    monkeypatch.chdir(tmp_path)
 
     # Add debugging and error handling
     URI = "s3://cache-datasets/cache_dataset_oracleGeneral/2007_msr/msr_hm_0.oracleGeneral.zst"
@@ -39,12 +41,3 @@ def test_analyzer_common():
     )
 
     analyzer.run()
-
-    # Clean file after test, match all files with the prefix "TestAnalyzerResults"
-    for file in os.listdir("."):
-        if file.startswith("TestAnalyzerResults"):
-            os.remove(file)
-    # Remove file named "stat"
-    stat_file = "stat"
-    if os.path.exists(stat_file):
-        os.remove(stat_file)
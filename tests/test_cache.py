@@ -7,6 +7,7 @@ This module tests various cache algorithms and their functionality.
 import pytest
 import tempfile
 import os
+import numpy as np
 from libcachesim import (
     # Basic algorithms
     LHD,
@@ -27,7 +28,11 @@ from libcachesim import (
     Request,
     ReqOp,
     SyntheticReader,
+    PluginCache,
+    TraceReader,
+    Util,
 )
+from libcachesim.libcachesim_python import ReaderInitParam, TraceType
 
 # Try to import optional algorithms that might not be available
 try:
@@ -384,6 +389,179 @@ class TestCacheWithSyntheticTrace:
         # Basic sanity checks
         assert 0.0 <= miss_ratio <= 1.0
 
+    def test_process_trace_start_and_max_req(self):
+        """Test that a Python reader honours start_req and max_req across batches"""
+        reader = SyntheticReader(num_of_req=20000, obj_size=100, alpha=1.0, dist="zipf", num_objects=2000, seed=42)
+
+        cache = LRU(10240)
+        hits = [cache.get(req) for req in list(reader)[100:15100]]
+        expected = 1.0 - sum(hits) / len(hits)
+
+        miss_ratio, byte_miss_ratio = LRU(10240).process_trace(reader, start_req=100, max_req=15000)
+        assert miss_ratio == pytest.approx(expected)
+        assert byte_miss_ratio == pytest.approx(expected)
+
+    def test_process_trace_reused_request(self):
+        """Test a Python reader that refills one Request for every step"""
+        rng = np.random.default_rng(42)
+        obj_ids = rng.zipf(1.2, 20000) % 2000
+        obj_sizes = rng.integers(1, 200, 20000)
+
+        class ReusingReader:
+            c_reader = False
+
+            def reset(self):
+                pass
+
+            def __iter__(self):
+                req = Request()
+                req.valid = True
+                for obj_id, obj_size in zip(obj_ids.tolist(), obj_sizes.tolist()):
+                    req.obj_id = obj_id
+                    req.obj_size = obj_size
+                    yield req
+
+        cache = LRU(10240)
+        n_hit = bytes_hit = 0
+        for obj_id, obj_size in zip(obj_ids[100:15100].tolist(), obj_sizes[100:15100].tolist()):
+            req = Request()
+            req.obj_id = obj_id
+            req.obj_size = obj_size
+            if cache.get(req):
+                n_hit += 1
+                bytes_hit += obj_size
+
+        miss_ratio, byte_miss_ratio = LRU(10240).process_trace(ReusingReader(), start_req=100, max_req=15000)
+        assert miss_ratio == pytest.approx(1.0 - n_hit / 15000)
+        assert byte_miss_ratio == pytest.approx(1.0 - bytes_hit / int(obj_sizes[100:15100].sum()))
+
+    def test_process_trace_belady_full_request(self, monkeypatch):
+        """Test that Belady gets full requests from array-capable readers"""
+        reader = SyntheticReader(num_of_req=5000, obj_size=100, alpha=1.0, dist="zipf", num_objects=500, seed=42)
+
+        cache = Belady(10240)
+        hits = [cache.get(req) for req in reader]
+        expected = 1.0 - sum(hits) / len(hits)
+
+        def read_arrays(n):
+            raise AssertionError("get_batch leaves op and next_access_vtime at their defaults")
+
+        monkeypatch.setattr(reader, "read_arrays", read_arrays)
+        miss_ratio, byte_miss_ratio = Belady(10240).process_trace(reader)
+        assert miss_ratio == pytest.approx(expected)
+        assert byte_miss_ratio == pytest.approx(expected)
+
+    def test_process_trace_sweep(self):
+        """Test that a threaded sweep matches processing each cache in turn"""
+        reader = SyntheticReader(num_of_req=5000, obj_size=100, alpha=1.0, dist="zipf", num_objects=500, seed=42)
+        sizes = [1024, 4096, 16384]
+
+        readers = [reader.clone() for _ in sizes]
+        results = Util.process_trace_sweep([LRU(size) for size in sizes], readers)
+        expected = [LRU(size).process_trace(r) for size, r in zip(sizes, readers)]
+        assert results == expected
+
+        with pytest.raises(ValueError):
+            Util.process_trace_sweep([LRU(1024), LRU(2048)], [reader, reader])
+
+    def test_process_trace_sharded(self, tmp_path):
+        """Test sharded processing of a C++ reader trace"""
+        rng = np.random.default_rng(42)
+        trace_path = tmp_path / "trace.csv"
+        with open(trace_path, "w") as f:
+            f.write("timestamp,obj_id,obj_size\n")
+            for i, obj_id in enumerate(rng.zipf(1.2, 5000) % 1000):
+                f.write(f"{i},{obj_id},100\n")
+
+        params = ReaderInitParam(has_header=True, delimiter=",", obj_id_is_num=True)
+        params.time_field = 1
+        params.obj_id_field = 2
+        params.obj_size_field = 3
+        reader = TraceReader(trace=str(trace_path), trace_type=TraceType.CSV_TRACE, reader_init_params=params)
+
+        # A single shard sees the whole trace
+        assert Util.process_trace_sharded([LRU(10000)], reader) == LRU(10000).process_trace(reader)
+
+        miss_ratio, byte_miss_ratio = Util.process_trace_sharded([LRU(2500) for _ in range(4)], reader)
+        assert 0.0 < miss_ratio < 1.0
+        assert byte_miss_ratio == pytest.approx(miss_ratio)
+
+        with pytest.raises(ValueError):
+            Util.process_trace_sharded([LRU(10000)], SyntheticReader(num_of_req=100))
+
+    def test_process_trace_callback(self):
+        """Test that the callback sees running miss counts and results match process_trace"""
+        reader = SyntheticReader(num_of_req=1050, obj_size=100, alpha=1.0, dist="zipf", num_objects=100, seed=42)
+        expected = LRU(1024).process_trace(reader)
+
+        reports = []
+        result = LRU(1024).process_trace_callback(reader, on_miss=reports.append, batch_report=100)
+
+        assert result == expected
+        # ten full batches plus the trailing partial one
+        assert len(reports) == 11
+        assert reports == sorted(reports)
+        assert reports[-1] == round(expected[0] * 1050)
+
+        with pytest.raises(ValueError):
+            LRU(1024).process_trace_callback(reader, batch_report=0)
+
+    def test_process_trace_callback_c_reader(self, tmp_path):
+        """Test the C++ callback loop against process_trace, including the final partial batch"""
+        rng = np.random.default_rng(42)
+        trace_path = tmp_path / "trace.csv"
+        with open(trace_path, "w") as f:
+            f.write("timestamp,obj_id,obj_size\n")
+            for i, obj_id in enumerate(rng.zipf(1.2, 1050) % 1000):
+                f.write(f"{i},{obj_id},100\n")
+
+        params = ReaderInitParam(has_header=True, delimiter=",", obj_id_is_num=True)
+        params.time_field = 1
+        params.obj_id_field = 2
+        params.obj_size_field = 3
+        reader = TraceReader(trace=str(trace_path), trace_type=TraceType.CSV_TRACE, reader_init_params=params)
+        expected = LRU(10000).process_trace(reader)
+
+        # Running miss count after every 100 requests and after the last one
+        cache = LRU(10000)
+        n_miss = 0
+        expected_reports = []
+        for i, req in enumerate(reader, 1):
+            n_miss += not cache.get(req)
+            if i % 100 == 0 or i == 1050:
+                expected_reports.append(n_miss)
+
+        reports = []
+        result = LRU(10000).process_trace_callback(reader, on_miss=reports.append, batch_report=100)
+
+        assert result == expected
+        # ten full batches plus the trailing partial one
+        assert len(reports) == 11
+        assert reports == expected_reports
+
+
+class TestPluginCache:
+    """Test Python plugin caches"""
+
+    def test_optional_hooks(self):
+        """Test that a plugin without hit, remove and free hooks behaves like FIFO"""
+        from collections import OrderedDict
+
+        plugin_fifo = PluginCache(
+            cache_size=64,
+            cache_init_hook=lambda params: OrderedDict(),
+            cache_hit_hook=None,
+            cache_miss_hook=lambda data, req: data.__setitem__(req.obj_id, None),
+            cache_eviction_hook=lambda data, req: data.popitem(last=False)[0],
+            cache_remove_hook=None,
+            cache_name="PluginFIFO",
+        )
+        ref_fifo = FIFO(64)
+
+        reader = SyntheticReader(num_of_req=2000, obj_size=1, alpha=1.0, dist="zipf", num_objects=200, seed=42)
+        for req in reader:
+            assert plugin_fifo.get(req) == ref_fifo.get(req)
+
 
 class TestCacheStatistics:
     """Test cache statistics and metrics"""
@@ -513,6 +691,59 @@ class TestCacheOperations:
         assert evict_obj is not None
         assert hasattr(evict_obj, "obj_id")
 
+    def test_cache_get_batch(self):
+        """Test get_batch matches per-request get"""
+        obj_ids = np.array([1, 2, 3, 1, 4, 5, 1, 2], dtype=np.uint64)
+        obj_sizes = np.full(len(obj_ids), 50, dtype=np.int64)
+
+        cache = LRU(200)
+        expected = []
+        for obj_id, obj_size in zip(obj_ids, obj_sizes):
+            req = Request()
+            req.obj_id = int(obj_id)
+            req.obj_size = int(obj_size)
+            expected.append(cache.get(req))
+
+        batch_cache = LRU(200)
+        hits = batch_cache.get_batch(obj_ids, obj_sizes)
+        assert hits.dtype == np.bool_
+        assert hits.tolist() == expected
+        assert batch_cache.get_n_obj() == cache.get_n_obj()
+
+        with pytest.raises(ValueError):
+            batch_cache.get_batch(obj_ids, obj_sizes[:-1])
+
+        # Without sizes every object has size 1
+        unit_cache = LRU(4)
+        assert unit_cache.get_batch(np.array([1, 2, 3, 1, 5, 6])).tolist() == [False, False, False, True, False, False]
+        assert unit_cache.get_occupied_byte() == 4
+
+    def test_cache_set_cache_size(self):
+        """Test that cache_size follows set_cache_size"""
+        cache = LRU(1000)
+        assert cache.cache_size == 1000
+        assert cache.cache_name == "LRU"
+
+        cache.set_cache_size(2000)
+        assert cache.cache_size == 2000
+
+    def test_cache_find_or_insert(self):
+        """Test the fused find/insert call"""
+        cache = LRU(1000)
+        req = Request()
+        req.obj_id = 7
+        req.obj_size = 100
+
+        obj, inserted = cache.find_or_insert(req)
+        assert inserted
+        assert obj.obj_id == 7
+        assert cache.get_n_obj() == 1
+
+        obj, inserted = cache.find_or_insert(req)
+        assert not inserted
+        assert obj.obj_id == 7
+        assert cache.get_n_obj() == 1
+
 
 class TestCacheOptionalAlgorithms:
     """Test optional algorithms"""
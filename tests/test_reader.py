@@ -7,6 +7,7 @@ This module tests both TraceReader and SyntheticReader functionality.
 import pytest
 import tempfile
 import os
+import numpy as np
 from libcachesim import TraceReader, SyntheticReader
 from libcachesim.libcachesim_python import TraceType, SamplerType, Request, ReaderInitParam, Sampler
 
@@ -92,6 +93,44 @@ class TestSyntheticReader:
         read_req = reader.read_one_req()
         assert read_req.valid == True  # Should still be able to read
 
+    def test_batches(self):
+        """Test reading requests as array batches"""
+        reader = SyntheticReader(num_of_req=25, obj_size=1024, seed=42)
+        reader.skip_n_req(5)
+
+        batches = list(reader.batches(8))
+        assert [len(obj_ids) for obj_ids, _ in batches] == [8, 8, 4]
+        assert np.concatenate([obj_ids for obj_ids, _ in batches]).tolist() == reader.obj_ids[5:].tolist()
+        assert all((obj_sizes == 1024).all() and len(obj_sizes) == len(obj_ids) for obj_ids, obj_sizes in batches)
+
+        # The read position is consumed
+        assert list(reader.batches(8)) == []
+
+    def test_iter_requests_reuse(self):
+        """Test iterating with a single refilled Request"""
+        reader = SyntheticReader(num_of_req=50, obj_size=1024, seed=42)
+        expected = [(req.obj_id, req.obj_size, req.clock_time) for req in reader]
+
+        seen = [(req.obj_id, req.obj_size, req.clock_time, id(req)) for req in reader.iter_requests(copy=False)]
+        assert [entry[:3] for entry in seen] == expected
+        assert len({entry[3] for entry in seen}) == 1
+        assert reader.current_pos == 50
+
+    def test_read_arrays(self):
+        """Test reading requests as arrays"""
+        reader = SyntheticReader(num_of_req=50, obj_size=1024, seed=42)
+        expected = [(req.obj_id, req.obj_size, req.clock_time) for req in reader]
+
+        reader.reset()
+        obj_ids, obj_sizes, clock_times = reader.read_arrays(30)
+        assert reader.current_pos == 30
+        rest = reader.read_arrays(30)
+        assert len(rest[0]) == 20
+        assert len(reader.read_arrays(30)[0]) == 0
+
+        got = zip(*(np.concatenate(parts).tolist() for parts in zip((obj_ids, obj_sizes, clock_times), rest)))
+        assert list(got) == expected
+
     def test_clone_reader(self):
         """Test reader cloning"""
         reader = SyntheticReader(num_of_req=100, obj_size=1024, seed=42)
@@ -108,6 +147,17 @@ class TestSyntheticReader:
         assert cloned_reader.get_num_of_req() == reader.get_num_of_req()
         assert isinstance(cloned_reader, SyntheticReader)
 
+    def test_seeded_readers_match(self):
+        """Test that a seeded trace does not depend on when it is generated"""
+        reader = SyntheticReader(num_of_req=100, obj_size=1024, seed=42)
+        cloned_reader = reader.clone()
+        other = SyntheticReader(num_of_req=100, obj_size=1024, seed=7, dist="uniform")
+
+        # Ids are generated lazily, in a different order than the readers were created
+        other_ids = other.obj_ids.copy()
+        assert cloned_reader.obj_ids.tolist() == reader.obj_ids.tolist()
+        assert SyntheticReader(num_of_req=100, obj_size=1024, seed=7, dist="uniform").obj_ids.tolist() == other_ids.tolist()
+
     def test_invalid_parameters(self):
         """Test error handling for invalid parameters"""
         with pytest.raises(ValueError):
@@ -246,6 +296,53 @@ class TestTraceReader:
         finally:
             os.unlink(temp_file)
 
+    def test_trace_reader_read_batch(self):
+        """Test reading requests into preallocated arrays"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write("timestamp,obj_id,obj_size,op\n")
+            for i in range(10):
+                f.write(f"{i + 1},{100 + i},{1024 * (i + 1)},0\n")
+            temp_file = f.name
+
+        try:
+            read_init_param = ReaderInitParam(
+                has_header=True,
+                delimiter=",",
+                obj_id_is_num=True,
+            )
+            read_init_param.time_field = 1
+            read_init_param.obj_id_field = 2
+            read_init_param.obj_size_field = 3
+            read_init_param.op_field = 4
+
+            reader = TraceReader(trace=temp_file, trace_type=TraceType.CSV_TRACE, reader_init_params=read_init_param)
+
+            obj_ids = np.empty(4, dtype=np.uint64)
+            obj_sizes = np.empty(4, dtype=np.int64)
+            n_read = [reader.read_batch(obj_ids, obj_sizes) for _ in range(4)]
+            assert n_read == [4, 4, 2, 0]
+
+            reader.reset()
+            assert reader.read_batch(obj_ids, obj_sizes) == 4
+            assert obj_ids.tolist() == [100, 101, 102, 103]
+            assert obj_sizes.tolist() == [1024, 2048, 3072, 4096]
+
+            # Buffers are filled in place, so other dtypes are rejected
+            with pytest.raises(TypeError):
+                reader.read_batch(np.empty(4, dtype=np.int32), obj_sizes)
+
+            reader.reset()
+            batches = [(obj_ids.tolist(), obj_sizes.tolist()) for obj_ids, obj_sizes in reader.batches(4)]
+            assert [len(obj_ids) for obj_ids, _ in batches] == [4, 4, 2]
+            assert sum((obj_ids for obj_ids, _ in batches), []) == list(range(100, 110))
+            assert batches[2][1] == [9216, 10240]
+
+            # The read position is consumed
+            assert list(reader.batches(4)) == []
+
+        finally:
+            os.unlink(temp_file)
+
     def test_trace_reader_sampling(self):
         """Test sampling functionality"""
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f: